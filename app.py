@@ -38,7 +38,7 @@ def build_app():
                 if pid == "__LIKED_SONGS__":
                     # Handle special Liked Songs playlist - requires user-library-read scope
                     try:
-                        for t in sp.user_saved_tracks():
+                        for t in sp.iter_user_saved_tracks():
                             t['playlist_id'] = pid
                             tracks.append(t)
                     except Exception as liked_error:
@@ -47,7 +47,7 @@ def build_app():
                         continue
                 else:
                     # Handle regular playlists
-                    for t in sp.playlist_tracks(pid):
+                    for t in sp.iter_playlist_tracks(pid):
                         t['playlist_id'] = pid
                         tracks.append(t)
             except RuntimeError as e:
@@ -105,16 +105,26 @@ def build_app():
     from youspotter import status as st
     def load_snapshot():
         try:
-            raw = db.get_setting('status_snapshot') or ''
-            return json.loads(raw) if raw else None
+            data = st.decode_snapshot(db.get_setting('status_snapshot') or '')
+            if isinstance(data, dict):
+                # Replay progress events written since the last full snapshot
+                for raw_event in db.fetch_status_events():
+                    st.apply_patch(data, st.decode_snapshot(raw_event) or {})
+            return data
         except Exception:
             return None
     def save_snapshot(data: dict):
         try:
-            db.set_setting('status_snapshot', json.dumps(data))
+            db.set_setting('status_snapshot', st.encode_snapshot(data))
+            db.clear_status_events()
         except Exception:
             pass
-    st.register_persistence(load_snapshot, save_snapshot)
+    def save_patch(event: dict):
+        try:
+            db.append_status_event(st.encode_snapshot(event))
+        except Exception:
+            pass
+    st.register_persistence(load_snapshot, save_snapshot, save_patch)
 
     # Clean up stale download state from previous sessions
     cleaned_items = st.cleanup_startup_state()
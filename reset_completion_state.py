@@ -14,7 +14,6 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from youspotter.storage import DB
 from youspotter.status import get_status, reset_false_completions, add_recent
-import json
 
 def main():
     # Use same DB path as app
@@ -25,13 +24,12 @@ def main():
     from youspotter import status as st
     def load_snapshot():
         try:
-            raw = db.get_setting('status_snapshot') or ''
-            return json.loads(raw) if raw else None
+            return st.decode_snapshot(db.get_setting('status_snapshot') or '')
         except Exception:
             return None
     def save_snapshot(data: dict):
         try:
-            db.set_setting('status_snapshot', json.dumps(data))
+            db.set_setting('status_snapshot', st.encode_snapshot(data))
         except Exception:
             pass
     st.register_persistence(load_snapshot, save_snapshot)
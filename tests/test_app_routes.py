@@ -77,3 +77,71 @@ def test_sync_status_includes_progress(tmp_path: Path):
     assert data['processed'] == 5
     assert data['total'] == 10
     assert 'heartbeat_epoch' in data
+
+
+def test_reset_queue_moves_current_to_completed():
+    from copy import deepcopy
+    from youspotter import status
+
+    original_state = deepcopy(status.get_status())
+    try:
+        status.load_state({'queue': {'current': [{'artist': 'A', 'title': 'T1'}, {'artist': 'A', 'title': 'T2'}],
+                                     'pending': [{'artist': 'A', 'title': 'P'}],
+                                     'completed': [{'artist': 'A', 'title': 'Done', 'status': 'downloaded'}]}})
+        client = create_app().test_client()
+        r = client.post('/reset-queue')
+        assert r.get_json()['moved_to_completed'] == 2
+        queue = status.get_status()['queue']
+        assert queue['current'] == []
+        assert [i['title'] for i in queue['pending']] == ['P']
+        assert [(i['title'], i['status']) for i in queue['completed']] == [
+            ('T2', 'missing'), ('T1', 'missing'), ('Done', 'downloaded')]
+    finally:
+        status.load_state(original_state)
+
+
+def test_reset_queue_keeps_completed_bounded():
+    from copy import deepcopy
+    from youspotter import status
+
+    original_state = deepcopy(status.get_status())
+    try:
+        status.load_state({'queue': {'current': [{'artist': 'A', 'title': f'C{i}'} for i in range(10)],
+                                     'pending': [],
+                                     'completed': [{'artist': 'A', 'title': f'D{i}', 'status': 'downloaded'}
+                                                   for i in range(status._COMPLETED_LIMIT)]}})
+        r = create_app().test_client().post('/reset-queue')
+        assert r.get_json()['moved_to_completed'] == 10
+        completed = status.get_status()['queue']['completed']
+        assert len(completed) == status._COMPLETED_LIMIT
+        assert completed[0]['title'] == 'C9'
+    finally:
+        status.load_state(original_state)
+
+
+def test_playlist_cache_is_read_from_db_once(tmp_path: Path, monkeypatch):
+    import json
+    import time
+    from youspotter.spotify_client import SpotifyClient
+    from youspotter.storage import DB
+
+    db_path = tmp_path / 'pl.db'
+    payload = {'timestamp': int(time.time()), 'expires_at': int(time.time()) + 900,
+               'data': [{'id': 'p1', 'name': 'Mix', 'tracks': 3}]}
+    seed = DB(db_path)
+    seed.set_kv('playlist_cache', json.dumps(payload))
+    seed.set_setting('selected_playlists', json.dumps({'p1': {'song': True, 'artist': False, 'album': True}}))
+    seed.flush()
+
+    reads = []
+    original_get_kv = DB.get_kv
+    monkeypatch.setattr(DB, 'get_kv', lambda self, key: reads.append(key) or original_get_kv(self, key))
+    monkeypatch.setattr(SpotifyClient, 'iter_user_saved_tracks', lambda self: iter(()))
+    client = create_app(db_path=str(db_path)).test_client()
+    for _ in range(2):
+        r = client.get('/playlists')
+        assert r.status_code == 200
+        liked, mix = r.get_json()
+        assert liked['id'] == '__LIKED_SONGS__' and not liked['selected']
+        assert (mix['id'], mix['selected'], mix['song'], mix['artist'], mix['album']) == ('p1', True, True, False, True)
+    assert reads.count('playlist_cache') == 1
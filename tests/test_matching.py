@@ -4,6 +4,25 @@ def test_normalization_feat_and_case():
     assert normalize_text('Bohemian Rhapsody (feat. X)') == 'bohemian rhapsody'
     assert normalize_text('Queen') == 'queen'
 
+def test_match_normalization_strips_ft_without_changing_identities():
+    from youspotter.queue import identity_key
+    from youspotter.utils.matching import normalize_match_text, song_match_strict
+    # normalize_text feeds identity_key, so only the matching normalizer drops ft./featuring
+    assert normalize_text('Song ft. B') == 'song ft b'
+    assert identity_key({'artist': 'A', 'title': 'Song ft. B', 'duration': 200}).startswith('a|song ft b|')
+    assert normalize_match_text('Song - ft. Drake') == normalize_match_text('Song (Featuring Drake)') == 'song'
+    assert normalize_match_text('Left.') == 'left'
+    assert normalize_match_text('Featuring Love') == 'featuring love'
+    # without brackets or " - " the word may be part of the title itself
+    assert normalize_match_text('Left Featuring Nobody') == 'left featuring nobody'
+    assert not song_match_strict({'artist': 'A', 'title': 'Left', 'duration': 200},
+                                 {'artist': 'A', 'title': 'Left Featuring Nobody', 'duration': 200})
+
+def test_normalization_folds_accents():
+    assert normalize_text('Beyoncé') == 'beyonce'
+    assert normalize_text('Motörhead – Ace of Spades') == 'motorhead ace of spades'
+    assert normalize_text('Sigur Rós ﬁ 日本') == 'sigur ros fi'
+
 def test_duration_tolerance():
     assert duration_within_tolerance(354, 350, tolerance=5)
     assert not duration_within_tolerance(354, 340, tolerance=5)
@@ -18,3 +37,46 @@ def test_song_match_rejects_title_mismatch():
     target = { 'artist': 'Queen', 'title': 'Bohemian Rhapsody', 'duration': 352 }
     assert not song_match(candidate, target)
 
+
+
+def test_prepared_target_matches_like_unprepared():
+    from youspotter.utils.matching import song_match_fuzzy, song_match_fuzzy_prepared, song_match_prepare
+    target = {'artist': 'Daft Punk', 'title': 'One More Time (feat. Romanthony)', 'duration': 320}
+    prepared = song_match_prepare(target)
+    candidates = [
+        {'artist': 'Daft Punk', 'title': 'One More Time', 'duration': 322},
+        {'artist': 'daft punk', 'title': 'One More Tme', 'duration': 318},
+        {'artist': 'Daft Punk', 'title': 'Harder Better', 'duration': 320},
+        {'artist': 'Daft Punk', 'title': 'One More Time', 'duration': 360},
+    ]
+    for c in candidates:
+        for strict in (False, True):
+            assert song_match_fuzzy_prepared(c, prepared, use_strict=strict) == song_match_fuzzy(c, target, use_strict=strict)
+
+
+def test_length_prefilter_agrees_with_similarity():
+    from youspotter.utils.matching import _similar_enough, string_similarity
+    words = ['', 'a', 'queen', 'queens', 'bohemian rhapsody', 'bohemian rhapsody live', 'one more time']
+    for s1 in words:
+        for s2 in words:
+            for threshold in (0.0, 0.7, 0.8):
+                assert _similar_enough(s1, s2, threshold) == (string_similarity(s1, s2) >= threshold)
+
+
+def test_bounded_levenshtein_agrees_within_bound():
+    from youspotter.utils.matching import levenshtein_distance
+    words = ['', 'queen', 'queens', 'bohemian rhapsody', 'bohemian rhapsody live', 'one more time']
+    for s1 in words:
+        for s2 in words:
+            distance = levenshtein_distance(s1, s2)
+            for max_dist in (0, 1, 3, 10):
+                bounded = levenshtein_distance(s1, s2, max_distance=max_dist)
+                assert bounded == min(distance, max_dist + 1)
+
+
+def test_strict_match_identical_metadata_still_checks_duration():
+    from youspotter.utils.matching import song_match_strict
+    target = {'artist': 'Beyoncé', 'title': 'Halo', 'duration': 261}
+    assert song_match_strict({'artist': 'Beyoncé', 'title': 'Halo', 'duration': 263}, target)
+    assert not song_match_strict({'artist': 'Beyoncé', 'title': 'Halo', 'duration': 300}, target)
+    assert song_match_strict({'artist': 'beyonce', 'title': 'HALO', 'duration': 261}, target)
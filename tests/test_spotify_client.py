@@ -0,0 +1,117 @@
+from urllib.parse import parse_qs, urlparse
+
+from youspotter.spotify_client import SpotifyClient
+from youspotter.storage import DB, TokenStore
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {}
+        self.text = ''
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def test_playlist_tracks_prefetches_remaining_pages_in_order(tmp_path, monkeypatch):
+    db = DB(tmp_path / 't.db')
+    TokenStore(db).save('AT', 'RT')
+    sc = SpotifyClient(db)
+    total = 250
+
+    def fake_get(url, headers=None, timeout=None):
+        offset = int(parse_qs(urlparse(url).query).get('offset', ['0'])[0])
+        items = [
+            {'track': {'name': f'T{i}', 'duration_ms': 1000, 'artists': [{'name': 'A'}], 'album': {'name': 'X'}}}
+            for i in range(offset, min(offset + 100, total))
+        ]
+        nxt = f"{url}&offset={offset + 100}" if offset + 100 < total else None
+        return FakeResponse({'items': items, 'total': total, 'limit': 100, 'offset': offset, 'next': nxt})
+
+    monkeypatch.setattr('youspotter.spotify_client.requests.get', fake_get)
+    titles = [t['title'] for t in sc.playlist_tracks('pl1')]
+    assert titles == [f'T{i}' for i in range(total)]
+
+
+def test_page_prefetch_is_bounded_by_window(tmp_path, monkeypatch):
+    from itertools import islice
+    from youspotter.spotify_client import PAGE_PREFETCH_WINDOW
+
+    db = DB(tmp_path / 't.db')
+    TokenStore(db).save('AT', 'RT')
+    sc = SpotifyClient(db)
+    total = 100 * 100
+    requested = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requested.append(url)
+        offset = int(parse_qs(urlparse(url).query).get('offset', ['0'])[0])
+        items = [
+            {'track': {'name': f'T{i}', 'duration_ms': 1000, 'artists': [{'name': 'A'}], 'album': {'name': 'X'}}}
+            for i in range(offset, min(offset + 100, total))
+        ]
+        nxt = f"{url}&offset={offset + 100}" if offset + 100 < total else None
+        return FakeResponse({'items': items, 'total': total, 'limit': 100, 'offset': offset, 'next': nxt})
+
+    monkeypatch.setattr('youspotter.spotify_client.requests.get', fake_get)
+    tracks = sc.iter_playlist_tracks('pl1')
+    assert len(list(islice(tracks, 101))) == 101
+    assert len(requested) <= 1 + PAGE_PREFETCH_WINDOW + 1
+    tracks.close()
+
+
+def test_album_tracks_are_cached_between_syncs(tmp_path):
+    db = DB(tmp_path / 't.db')
+    sc = SpotifyClient(db)
+    calls = []
+
+    def fake_iter(album_id):
+        calls.append(album_id)
+        yield {'artist': 'A', 'title': 'T', 'album_id': album_id}
+
+    sc.iter_album_tracks = fake_iter
+    first = sc.album_tracks('al1')
+    first[0]['expanded_from'] = 'album'
+    second = sc.album_tracks('al1')
+    assert calls == ['al1']
+    assert 'expanded_from' not in second[0]
+
+
+def test_forbidden_prefetched_page_raises_playlist_error(tmp_path, monkeypatch):
+    import pytest
+
+    db = DB(tmp_path / 't.db')
+    TokenStore(db).save('AT', 'RT')
+    sc = SpotifyClient(db)
+    total = 300
+
+    def fake_get(url, headers=None, timeout=None):
+        offset = int(parse_qs(urlparse(url).query).get('offset', ['0'])[0])
+        if offset == 200:
+            return FakeResponse({'error': {'message': 'Forbidden', 'reason': 'x'}}, status_code=403)
+        items = [
+            {'track': {'name': f'T{i}', 'duration_ms': 1000, 'artists': [{'name': 'A'}], 'album': {'name': 'X'}}}
+            for i in range(offset, min(offset + 100, total))
+        ]
+        nxt = f"{url}&offset={offset + 100}" if offset + 100 < total else None
+        return FakeResponse({'items': items, 'total': total, 'limit': 100, 'offset': offset, 'next': nxt})
+
+    monkeypatch.setattr('youspotter.spotify_client.requests.get', fake_get)
+    with pytest.raises(RuntimeError, match=r'^playlist_forbidden:pl1:'):
+        list(sc.iter_playlist_tracks('pl1'))
+
+
+def test_client_id_follows_settings_changes_without_invalidation(tmp_path):
+    db = DB(tmp_path / 't.db')
+    db.set_setting('spotify_client_id', 'old-id')
+    sc = SpotifyClient(db)
+    assert sc._client_id() == 'old-id'
+    db.set_setting('spotify_client_id', 'new-id')
+    assert sc._client_id() == 'new-id'
@@ -9,3 +9,193 @@ def test_status_endpoint_returns_structure():
     for key in ['missing', 'downloading', 'downloaded', 'recent']:
         assert key in data
 
+
+def test_queue_identity_keys_not_persisted():
+    from copy import deepcopy
+    from youspotter import status
+
+    saved = []
+    original_state = deepcopy(status.get_status())
+    original_save = status._persist_save
+    try:
+        status._persist_save = saved.append
+        track = {'artist': 'Queen', 'title': 'Bohemian Rhapsody', 'duration': 354}
+        status.set_queue([track])
+        assert '__id_key__' not in status.get_status()['queue']['pending'][0]
+        status.queue_move_to_current(dict(track))
+        assert status.get_status()['queue']['pending'] == []
+        assert '__id_key__' not in status.get_status()['queue']['current'][0]
+        assert '__id_key__' not in track
+        persisted = saved[-1]['queue']['current'][0]
+        assert '__id_key__' not in persisted
+        assert persisted['title'] == 'Bohemian Rhapsody'
+    finally:
+        status._persist_save = original_save
+        status.load_state(original_state)
+
+
+def test_progress_updates_emit_patch_events():
+    from copy import deepcopy
+    from youspotter import status
+
+    snapshots, events = [], []
+    original_state = deepcopy(status.get_status())
+    original_save, original_patch = status._persist_save, status._persist_patch
+    try:
+        status._persist_save, status._persist_patch = snapshots.append, events.append
+        track = {'artist': 'Queen', 'title': 'Bohemian Rhapsody', 'duration': 354}
+        status.queue_move_to_current(track)
+        written = len(snapshots)
+        status.queue_update_progress(track, 42)
+        assert len(snapshots) == written
+        assert events[-1]['op'] == 'progress' and events[-1]['pct'] == 42
+
+        replayed = deepcopy(snapshots[-1])
+        status.apply_patch(replayed, events[-1])
+        assert replayed['queue']['current'][-1]['progress'] == 42
+    finally:
+        status._persist_save, status._persist_patch = original_save, original_patch
+        status.load_state(original_state)
+
+
+def test_patch_written_early_never_drops_a_snapshot():
+    from copy import deepcopy
+    from youspotter import status
+
+    snapshots, events = [], []
+    original_state = deepcopy(status.get_status())
+    original_save, original_patch = status._persist_save, status._persist_patch
+    try:
+        status._persist_save, status._persist_patch = snapshots.append, events.append
+        track = {'artist': 'Queen', 'title': 'Bohemian Rhapsody', 'duration': 354}
+        status.queue_move_to_current(track)
+        with status._lock:
+            status._state['songs'] = 7
+            snapshot = status._snapshot()
+            event = status._patch({"op": "progress", "key": status._key_of(track), "pct": 10})
+        # The patch reaches the writer before the snapshot it was taken on
+        status._persist_event(event)
+        status._persist(snapshot)
+        assert snapshots[-1]['songs'] == 7
+    finally:
+        status._persist_save, status._persist_patch = original_save, original_patch
+        status.load_state(original_state)
+
+
+def test_progress_for_unknown_item_persists_nothing():
+    from copy import deepcopy
+    from youspotter import status
+
+    snapshots, events = [], []
+    original_state = deepcopy(status.get_status())
+    original_save, original_patch = status._persist_save, status._persist_patch
+    try:
+        status._persist_save, status._persist_patch = snapshots.append, events.append
+        status.queue_update_progress({'artist': 'Nobody', 'title': 'Nothing', 'duration': 1}, 50)
+        assert snapshots == [] and events == []
+    finally:
+        status._persist_save, status._persist_patch = original_save, original_patch
+        status.load_state(original_state)
+
+
+def test_add_recent_is_buffered_and_flushed():
+    import time
+    from copy import deepcopy
+    from youspotter import status
+
+    saved = []
+    original_state = deepcopy(status.get_status())
+    original_save = status._persist_save
+    try:
+        status._persist_save = saved.append
+        status.add_recent("first")
+        status.add_recent("second", "ERROR")
+        recent = status.get_status()['recent']
+        assert recent[0].endswith("ERROR: second")
+        assert recent[1].endswith("INFO: first")
+
+        status.add_recent("third")
+        deadline = time.time() + 2
+        while not any(r.endswith("INFO: third") for s in saved for r in s['recent']):
+            assert time.time() < deadline, "flush timer did not persist buffered message"
+            time.sleep(0.05)
+    finally:
+        status._persist_save = original_save
+        status.load_state(original_state)
+
+
+def test_recent_drained_by_get_status_is_still_flushed():
+    import time
+    from copy import deepcopy
+    from youspotter import status
+
+    saved = []
+    original_state = deepcopy(status.get_status())
+    original_save = status._persist_save
+    try:
+        status._persist_save = saved.append
+        status.add_recent("read before flush")
+        assert status.get_status()['recent'][0].endswith("INFO: read before flush")
+        deadline = time.time() + 2
+        while not any(r.endswith("INFO: read before flush") for s in saved for r in s['recent']):
+            assert time.time() < deadline, "line drained by get_status() was never persisted"
+            time.sleep(0.05)
+    finally:
+        status._persist_save = original_save
+        status.load_state(original_state)
+
+
+def test_counts_and_queue_persist_as_one_snapshot():
+    from copy import deepcopy
+    from youspotter import status
+
+    saved = []
+    original_state = deepcopy(status.get_status())
+    original_save = status._persist_save
+    try:
+        status._persist_save = saved.append
+        track = {'artist': 'Queen', 'title': 'Bohemian Rhapsody', 'duration': 354}
+        status.set_counts_and_queue({'songs': 3, 'missing': 1, 'bogus': 9}, [track])
+        assert len(saved) == 1
+        assert saved[0]['songs'] == 3 and saved[0]['missing'] == 1
+        assert 'bogus' not in saved[0]
+        assert saved[0]['queue']['pending'] == [track]
+    finally:
+        status._persist_save = original_save
+        status.load_state(original_state)
+
+
+def test_catalog_rows_are_queued_without_copies():
+    from copy import deepcopy
+    from youspotter import status
+
+    original_state = deepcopy(status.get_status())
+    try:
+        row = {'artist': 'Queen', 'title': 'Bohemian Rhapsody', 'duration': 354, 'identity': 'queen|br|70'}
+        status.set_queue(iter([row]))
+        assert status.get_status()['queue']['pending'][0] is row
+        status.queue_move_to_current({'artist': 'x', 'title': 'y', 'identity': 'queen|br|70'})
+        assert status.get_status()['queue']['pending'] == []
+    finally:
+        status.load_state(original_state)
+
+
+def test_queue_moves_head_and_caps_completed(monkeypatch):
+    from copy import deepcopy
+    from youspotter import status
+
+    original_state = deepcopy(status.get_status())
+    monkeypatch.setattr(status, '_COMPLETED_LIMIT', 3)
+    try:
+        tracks = [{'artist': 'Queen', 'title': f'Song {n}', 'duration': 200 + n} for n in range(5)]
+        status.set_queue(tracks)
+        status.queue_move_to_current(tracks[0])
+        status.queue_move_to_current(tracks[3])
+        assert [p['title'] for p in status.get_status()['queue']['pending']] == ['Song 1', 'Song 2', 'Song 4']
+        for track in tracks:
+            status.queue_complete(track, True)
+        queue = status.get_status()['queue']
+        assert queue['current'] == []
+        assert [c['title'] for c in queue['completed']] == ['Song 4', 'Song 3', 'Song 2']
+    finally:
+        status.load_state(original_state)
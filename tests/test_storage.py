@@ -20,3 +20,154 @@ def test_token_store_no_logging(tmp_path: Path, caplog):
     assert at == 'ACCESS_TOKEN'
     assert rt == 'REFRESH_TOKEN'
 
+
+def test_token_load_racing_a_save_does_not_cache_old_tokens(tmp_path: Path, monkeypatch):
+    import youspotter.storage as storage
+    monkeypatch.setattr(storage, 'keyring', None)
+    db = DB(tmp_path / 'test.db')
+    ts = TokenStore(db)
+    ts.save('OLD_AT', 'OLD_RT')
+    storage._token_cache.clear()
+
+    read_old = TokenStore._load_uncached
+
+    def load_then_rotate(self):
+        tokens = read_old(self)
+        ts.save('NEW_AT', 'NEW_RT')  # a concurrent refresh lands mid-load
+        return tokens
+
+    monkeypatch.setattr(TokenStore, '_load_uncached', load_then_rotate)
+    assert ts.load() == ('OLD_AT', 'OLD_RT')
+    monkeypatch.setattr(TokenStore, '_load_uncached', read_old)
+    assert ts.load() == ('NEW_AT', 'NEW_RT')
+
+
+def test_mark_download_failure_backs_off_exponentially(tmp_path: Path):
+    import time
+    db = DB(tmp_path / 'test.db')
+    db.upsert_tracks([{'identity': 'a|b|1', 'artist': 'A', 'title': 'B', 'duration': 5}])
+    delays = []
+    for _ in range(6):
+        before = int(time.time())
+        db.mark_download_failure('a|b|1', 'boom')
+        with db.connection() as conn:
+            attempts, retry_after, status = conn.execute(
+                "SELECT download_attempts, retry_after, status FROM tracks WHERE identity='a|b|1'"
+            ).fetchone()
+        delays.append(retry_after - before)
+        assert status == 'missing'
+    assert attempts == 6
+    assert [round(d, -2) for d in delays] == [300, 900, 2700, 8100, 21600, 21600]
+
+
+def test_queue_selection_uses_index_without_sort(tmp_path: Path):
+    db = DB(tmp_path / 'test.db')
+    with db.connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT identity FROM tracks "
+            "WHERE status='missing' AND (retry_after IS NULL OR retry_after <= 0) ORDER BY last_seen ASC"
+        ).fetchall()
+    details = ' '.join(row[-1] for row in plan)
+    assert 'idx_tracks_queue' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_catalog_grouping_streams_from_covering_indexes(tmp_path: Path):
+    db = DB(tmp_path / 'test.db')
+    with db.connection() as conn:
+        for sql in (
+            "SELECT artist, COUNT(*) FROM tracks GROUP BY artist ORDER BY artist COLLATE NOCASE",
+            "SELECT album, artist, COUNT(*) FROM tracks WHERE album IS NOT NULL AND album != '' "
+            "GROUP BY album, artist ORDER BY album COLLATE NOCASE",
+        ):
+            details = ' '.join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+            assert 'COVERING INDEX' in details
+            assert 'TEMP B-TREE FOR GROUP BY' not in details
+
+
+def test_load_config_is_reparsed_only_after_settings_change(tmp_path: Path):
+    from youspotter.config import load_config
+    db = DB(tmp_path / 'test.db')
+    db.set_setting('bitrate', '192')
+    first = load_config(db)
+    assert first['bitrate'] == 192
+    first['bitrate'] = 0  # callers get their own copy
+    assert load_config(db)['bitrate'] == 192
+    version = db.settings_version()
+    db.set_setting('bitrate', '320')
+    assert db.settings_version() != version
+    assert load_config(db)['bitrate'] == 320
+
+
+def test_unchanged_setting_is_not_rewritten(tmp_path: Path):
+    db = DB(tmp_path / 'test.db')
+    db.set_setting('format', 'mp3')
+    db.flush()
+    version = db.settings_version()
+    db.set_setting('format', 'mp3')
+    assert db.settings_version() == version
+    assert not db._writer.pending()
+    db.set_setting('format', 'flac')
+    assert db.get_setting('format') == 'flac'
+
+
+def test_failed_setting_write_is_reported_and_uncached(tmp_path: Path):
+    import sqlite3
+    import pytest
+    db = DB(tmp_path / 'test.db')
+    db.set_setting('good', 'before')
+    with db.connection() as conn:
+        conn.execute(
+            "CREATE TRIGGER reject_bad BEFORE INSERT ON settings WHEN NEW.key = 'bad' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+        conn.commit()
+    db.set_setting('bad', 'value')
+    db.set_setting('good', 'after')
+    with pytest.raises(sqlite3.Error):
+        db.flush()
+    assert db.get_setting('bad') is None
+    assert db.get_setting('good') == 'after'
+    db.flush()  # the failure was reported once
+
+
+def test_flush_restarts_a_dead_writer(tmp_path: Path):
+    import sqlite3
+    import threading
+    from youspotter.storage import _WriteCoalescer
+    path = tmp_path / 'writer.db'
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("CREATE TABLE t (v TEXT)")
+    writer = _WriteCoalescer(path)
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    writer._thread = dead  # as if the writer thread had crashed
+    writer._q.put(("INSERT INTO t VALUES('x')", ()))
+    assert writer.flush(timeout=5) == []
+    with sqlite3.connect(str(path)) as conn:
+        assert conn.execute("SELECT v FROM t").fetchall() == [('x',)]
+
+
+def test_reconcile_does_not_undo_a_download_recorded_mid_pass(tmp_path: Path, monkeypatch):
+    import youspotter.storage as storage
+    db = DB(tmp_path / 'test.db')
+    db.upsert_tracks([{'identity': 'a|b|1', 'artist': 'A', 'title': 'B', 'duration': 5}])
+    db.mark_download_success('a|b|1', str(tmp_path / 'gone.mp3'))
+    new_file = tmp_path / 'new.mp3'
+    new_file.write_text('audio')
+    real_isfile = storage.os.path.isfile
+
+    def isfile_then_redownload(path):
+        # the download worker records a fresh file while reconcile is mid-pass
+        db.mark_download_success('a|b|1', str(new_file))
+        db.flush()
+        return real_isfile(path)
+
+    monkeypatch.setattr(storage.os.path, 'isfile', isfile_then_redownload)
+    db.reconcile_catalog_paths()
+    with db.connection() as conn:
+        status, local_path = conn.execute(
+            "SELECT status, local_path FROM tracks WHERE identity='a|b|1'"
+        ).fetchone()
+    assert (status, local_path) == ('downloaded', str(new_file))
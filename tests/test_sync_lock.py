@@ -16,3 +16,47 @@ def test_sync_lock_prevents_overlap():
     assert results.count(True) == 1
     assert results.count(False) == 1
 
+
+
+def test_timed_out_sync_is_abandoned_without_cross_thread_release():
+    from youspotter import sync_lock as sl
+    started, finish = threading.Event(), threading.Event()
+
+    def stuck():
+        with sync_lock() as acquired:
+            assert acquired
+            started.set()
+            finish.wait(5)
+
+    t = threading.Thread(target=stuck)
+    t.start(); started.wait(5)
+    assert sl.is_sync_running()
+    sl._busy_since -= sl._SYNC_TIMEOUT + 1
+    assert not sl.is_sync_running()
+    with sync_lock() as acquired:
+        assert acquired
+        finish.set(); t.join()
+        # the stuck owner released only its own (abandoned) lock
+        assert sl.is_sync_running()
+    assert not sl.is_sync_running()
+
+
+def test_status_polling_never_blocks_a_sync():
+    from youspotter.sync_lock import is_sync_running
+
+    stop = threading.Event()
+
+    def poll():
+        while not stop.is_set():
+            is_sync_running()
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    try:
+        for _ in range(2000):
+            with sync_lock() as acquired:
+                assert acquired
+    finally:
+        stop.set()
+        poller.join()
+    assert not is_sync_running()
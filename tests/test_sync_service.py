@@ -130,3 +130,163 @@ def test_get_sync_progress_reflects_updates(tmp_path):
     assert snapshot['processed'] == 10
     assert snapshot['total'] == 25
     assert snapshot['heartbeat_epoch'] >= 0
+
+
+def test_live_queue_moves_items_by_identity(tmp_path):
+    svc = make_service(tmp_path)
+    items = [
+        {'artist': 'A', 'title': 'One', 'duration': 100},
+        {'artist': 'B', 'title': 'Two', 'duration': 200},
+        {'artist': 'C', 'title': 'Three', 'duration': 300},
+    ]
+    svc.set_live_pending_queue(items)
+    svc.live_move_to_current(dict(items[1]))
+    svc.live_update_progress(items[1], 40)
+    live = svc.get_live_queue_status()
+    assert [p['title'] for p in live['pending']] == ['One', 'Three']
+    assert [(c['title'], c['progress']) for c in live['current']] == [('Two', 40)]
+
+    svc.live_complete_item(items[1], True)
+    live = svc.get_live_queue_status()
+    assert live['current'] == []
+    assert live['completed'][0]['title'] == 'Two'
+    assert live['completed'][0]['status'] == 'downloaded'
+
+
+def test_live_completed_history_is_bounded(tmp_path, monkeypatch):
+    import youspotter.sync_service as sync_module
+    monkeypatch.setattr(sync_module, 'LIVE_COMPLETED_LIMIT', 3)
+    svc = make_service(tmp_path)
+    for n in range(5):
+        svc.live_complete_item({'artist': 'A', 'title': f'Song {n}', 'duration': 100}, True)
+    assert [c['title'] for c in svc.get_live_queue_status()['completed']] == ['Song 4', 'Song 3', 'Song 2']
+
+
+def test_expand_tracks_fans_out_and_tags_source():
+    calls = []
+
+    def fetch(item_id):
+        calls.append(item_id)
+        if item_id == 'bad':
+            raise RuntimeError('boom')
+        return [{'artist': item_id, 'title': 'Song'}]
+
+    svc = SyncService(lambda: [], lambda t: [], lambda c, t, cfg: (False, None), enable_watchdog=False)
+    expanded = svc._expand_tracks([(fetch, 'a1', 'artist'), (fetch, 'bad', 'artist'), (fetch, 'a2', 'artist')])
+    assert sorted(calls) == ['a1', 'a2', 'bad']
+    assert [t['artist'] for t in expanded] == ['a1', 'a2']
+    assert all(t['expanded_from'] == 'artist' for t in expanded)
+
+
+def test_playlist_strategies_expand_through_spotify_client(tmp_path):
+    class FakeSpotify:
+        def artist_all_tracks(self, artist_id):
+            return [{"artist": "Queen", "title": "Radio Ga Ga", "duration": 343, "artist_id": artist_id}]
+
+        def album_tracks(self, album_id):
+            return [{"artist": "Queen", "title": "Love of My Life", "duration": 219, "album_id": album_id}]
+
+    base = [{"artist": "Queen", "title": "Bohemian Rhapsody", "duration": 354,
+             "playlist_id": "p1", "artist_id": "a1", "album_id": "al1"}]
+    db = DB(tmp_path / 'sync.db')
+    svc = SyncService(lambda: base, lambda t: [], lambda c, t, cfg: (False, None), db=db,
+                      fetch_playlist_strategies=lambda: {"p1": {"artist": True, "album": True}},
+                      spotify_client=FakeSpotify(), enable_watchdog=False)
+    assert svc.run_once() is True
+    with db.connection() as conn:
+        sources = dict(conn.execute("SELECT title, expanded_from FROM tracks"))
+    assert sources == {"Bohemian Rhapsody": "playlist", "Radio Ga Ga": "artist", "Love of My Life": "album"}
+
+
+def test_next_search_is_prefetched_during_download(tmp_path):
+    searches = []
+
+    def search_youtube(t):
+        searches.append(t['title'])
+        return [{"artist": t["artist"], "title": t["title"], "duration": t["duration"]}]
+
+    svc = SyncService(lambda: [], search_youtube, lambda c, t, cfg: (True, None), enable_watchdog=False)
+    svc.set_live_pending_queue([
+        {"artist": "Queen", "title": "Bohemian Rhapsody", "duration": 354, "identity": "q|br"},
+        {"artist": "Queen", "title": "Radio Ga Ga", "duration": 343, "identity": "q|rgg"},
+    ])
+    try:
+        svc._process_download_queue()
+        assert svc._prefetched_search[0] == "q|rgg"
+        svc._process_download_queue()
+        assert searches == ["Bohemian Rhapsody", "Radio Ga Ga"]
+        assert [c['title'] for c in svc.get_live_queue_status()['completed']] == ["Radio Ga Ga", "Bohemian Rhapsody"]
+    finally:
+        svc.stop_download_worker()
+
+
+def test_worker_wakes_when_pending_queue_changes():
+    svc = SyncService(lambda: [], lambda t: [{"artist": t["artist"], "title": t["title"], "duration": t["duration"]}],
+                      lambda c, t, cfg: (True, None), enable_watchdog=False)
+    svc._queue_wait_timeout = 60
+    svc.start_download_worker()
+    try:
+        time.sleep(0.2)  # let the worker go idle on the empty queue
+        svc.set_live_pending_queue([{"artist": "Queen", "title": "Radio Ga Ga", "duration": 343}])
+        deadline = time.time() + 5
+        while not svc.get_live_queue_status()['completed']:
+            assert time.time() < deadline, "worker did not wake for the new pending item"
+            time.sleep(0.05)
+    finally:
+        svc.stop_scheduler()
+        svc.stop_download_worker()
+    assert not svc._download_thread.is_alive()
+
+
+def test_download_counts_update_between_batched_reconciles(tmp_path):
+    music_dir = tmp_path / "Music"
+    music_dir.mkdir()
+    tracks = [
+        {"artist": "Queen", "title": "Bohemian Rhapsody", "duration": 354},
+        {"artist": "Queen", "title": "Radio Ga Ga", "duration": 343},
+    ]
+
+    def download_func(candidate, target, cfg):
+        file_path = music_dir / f"{target['artist']} - {target['title']}.mp3"
+        file_path.write_text("dummy audio content")
+        return True, str(file_path)
+
+    svc = SyncService(lambda: tracks, lambda t: [dict(t)], download_func,
+                      db=DB(tmp_path / 'sync.db'), enable_watchdog=False)
+    try:
+        assert svc.run_once() is True
+        assert get_status()["missing"] == 2
+        forced = []
+        svc.reconcile_catalog = lambda force=False: forced.append(force)
+        svc._process_download_queue()
+        assert forced == []  # no reconcile until the batch fills or the queue drains
+        st = get_status()
+        assert (st["downloaded"], st["missing"]) == (1, 1)
+    finally:
+        svc.stop_download_worker()
+
+
+def test_slow_downloads_do_not_reconcile_per_track(tmp_path):
+    music_dir = tmp_path / "Music"
+    music_dir.mkdir()
+    tracks = [{"artist": "Queen", "title": f"Song {i}", "duration": 200} for i in range(5)]
+
+    def download_func(candidate, target, cfg):
+        file_path = music_dir / f"{target['artist']} - {target['title']}.mp3"
+        file_path.write_text("dummy audio content")
+        return True, str(file_path)
+
+    svc = SyncService(lambda: tracks, lambda t: [dict(t)], download_func,
+                      db=DB(tmp_path / 'sync.db'), enable_watchdog=False)
+    try:
+        assert svc.run_once() is True
+        svc._reconcile_interval = 0  # every download outlasts the reconcile rate limit
+        passes = []
+        reconcile_paths = svc.db.reconcile_catalog_paths
+        svc.db.reconcile_catalog_paths = lambda: passes.append(1) or reconcile_paths()
+        while svc.get_live_queue_status()['pending']:
+            svc._process_download_queue()
+        assert len(passes) == 1  # only once the queue drained
+        assert get_status()["downloaded"] == 5
+    finally:
+        svc.stop_download_worker()
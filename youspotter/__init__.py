@@ -150,14 +150,11 @@ def create_app(service: Optional[SyncService] = None, db_path: Optional[str] = N
                 service._failed_items.clear()
 
             # Move failed items back to pending queue and reset error counts
-            from .status import reset_false_completions, set_status, get_status
+            from .status import reset_false_completions, set_status
             failed_count, success_count = reset_false_completions()
 
-            # Reset error counts in status
-            status = get_status()
-            status['missing'] = 0  # Reset error count
-            status['downloading'] = 0  # Reset downloading count
-            set_status(status)
+            # Reset error counts in status; only the counters change, so only they are passed
+            set_status({'missing': 0, 'downloading': 0})
 
             return jsonify({
                 "reset": True,
@@ -201,33 +198,15 @@ def create_app(service: Optional[SyncService] = None, db_path: Optional[str] = N
     def reset_queue():
         """Reset stale queue items that are stuck in 'current' status"""
         try:
-            from .status import get_status, set_status
-            status = get_status()
-            queue_data = status.get('queue', {})
+            from .status import fail_current_items
 
             # Move all current items to completed as "missing" (since they're stale)
-            current_items = queue_data.get('current', [])
-            completed_items = queue_data.get('completed', [])
-
-            # Mark current items as failed/missing and move to completed
-            for item in current_items:
-                item_copy = dict(item)
-                item_copy['status'] = 'missing'
-                from datetime import datetime, timezone
-                item_copy['timestamp'] = datetime.now(timezone.utc).isoformat()
-                completed_items.insert(0, item_copy)
-
-            # Update status with cleared current queue
-            updated_status = dict(status)
-            updated_status['queue']['current'] = []
-            updated_status['queue']['completed'] = completed_items
-
-            set_status(updated_status)
+            moved = fail_current_items()
 
             return jsonify({
                 "reset": True,
-                "moved_to_completed": len(current_items),
-                "message": f"Moved {len(current_items)} stale items from current to completed"
+                "moved_to_completed": moved,
+                "message": f"Moved {moved} stale items from current to completed"
             }), 200
 
         except Exception as e:
@@ -1,11 +1,28 @@
-from typing import Dict
+import os
+from typing import Dict, Tuple
 
 VALID_BITRATES = {128, 192, 256, 320}
 VALID_FORMATS = {"mp3", "flac", "m4a", "wav"}
 VALID_CONCURRENCY = {1, 2, 3, 4}
 
 
+# Parsed config per database file, tagged with the DB.settings_version() it was read at
+_parsed: Dict[str, Tuple[int, Dict]] = {}
+
+
 def load_config(db) -> Dict:
+    version_of = getattr(db, 'settings_version', None)
+    if version_of is None:
+        return _read_config(db)
+    key = os.path.abspath(str(db.path))
+    version = version_of()
+    cached = _parsed.get(key)
+    if cached is None or cached[0] != version:
+        cached = _parsed[key] = (version, _read_config(db))
+    return dict(cached[1])
+
+
+def _read_config(db) -> Dict:
     return {
         'host_path': db.get_setting('host_path') or '',
         'bitrate': int(db.get_setting('bitrate') or 128),
@@ -1,5 +1,12 @@
+import glob
 import os
+import tempfile
 from typing import Dict, List, Optional, Tuple
+
+from .logging import get_logger, with_context
+from .status import add_recent
+from .utils.path_template import to_ytdlp_outtmpl
+
 try:
     from yt_dlp import YoutubeDL as _YDL
 except Exception:  # pragma: no cover
@@ -24,7 +31,6 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
     br = int(cfg.get('bitrate', 128))
     ensure_dir(host_path)
     # Path template conversion (user-specified pattern)
-    from .utils.path_template import to_ytdlp_outtmpl
     user_tmpl = cfg.get('path_template') or '{artist}/{album}/{artist} - {title}.{ext}'
     try:
         out_part = to_ytdlp_outtmpl(user_tmpl)
@@ -35,7 +41,6 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
     url = candidate.get('url')
     if not url:
         try:
-            from .status import add_recent
             add_recent(f"Download aborted: no URL for {track.get('artist','unknown')} - {track.get('title','')}", "ERROR")
         except Exception:
             pass
@@ -64,14 +69,12 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
     cookie_header = cfg.get('yt_cookie', '').strip()
     if cookie_header and cookie_header.startswith('# Netscape HTTP Cookie File'):
         # User provided a full cookies.txt; write verbatim and use as cookiefile
-        import tempfile
         cf = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
         cf.write(cookie_header)
         cf.close()
         ydl_opts['cookiefile'] = cf.name
     elif cookie_header:
         # Create temporary cookie file for yt-dlp
-        import tempfile
         cookie_file = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
         try:
             # Convert header cookies to Netscape format
@@ -120,7 +123,6 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
             try:
                 probe_info = ydl.extract_info(url, download=False)
             except Exception as probe_error:
-                from .status import add_recent
                 add_recent(
                     f"Download probe failed ({type(probe_error).__name__}): {track.get('artist','unknown')} - {track.get('title','')}",
                     "ERROR",
@@ -131,7 +133,6 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
             available_kbps = [int(fmt.get('abr') or 0) for fmt in formats if fmt.get('abr')]
             max_available = max(available_kbps) if available_kbps else 0
             if min_kbps > max_available:
-                from .status import add_recent
                 add_recent(
                     f"Download blocked: requires ≥{min_kbps}kbps but max available is {max_available}kbps for {track.get('artist','unknown')} - {track.get('title','')}",
                     "ERROR",
@@ -142,7 +143,6 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
 
         # Clean up any leftover thumbnail files
         try:
-            import glob
             # Build thumbnail pattern based on the output path structure
             # yt-dlp saves thumbnails with the same base name but different extensions
             base_name = outtmpl.replace('%(' + 'ext' + ')s', '')  # Remove extension placeholder
@@ -168,10 +168,8 @@ def download_audio(candidate: Dict, track: Dict, cfg: Dict) -> Tuple[bool, Optio
 
         return True, final_path
     except Exception as e:
-        from .logging import get_logger, with_context
         with_context(get_logger(__name__), attempt=1)[0].error(f"yt-dlp download failed: {e}")
         try:
-            from .status import add_recent
             add_recent(f"Download failed ({type(e).__name__}): {track.get('artist','unknown')} - {track.get('title','')} — {str(e)}", "ERROR")
         except Exception:
             pass
@@ -1,10 +1,14 @@
 import base64
 import hashlib
+import itertools
+import logging
 import os
 import secrets
 import threading
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlencode
 
 import requests
@@ -15,6 +19,11 @@ from .storage import DB, TokenStore
 AUTH_URL = "https://accounts.spotify.com/authorize"
 TOKEN_URL = "https://accounts.spotify.com/api/token"
 SCOPE = "playlist-read-private playlist-read-collaborative user-library-read"
+PAGE_PREFETCH_WORKERS = 6  # concurrent page requests once a listing's total is known
+PAGE_PREFETCH_WINDOW = PAGE_PREFETCH_WORKERS * 2  # pages requested ahead of the consumer
+# Artist/album track listings change slowly; scheduled syncs reuse them for this long
+EXPANSION_CACHE_TTL = 3600
+EXPANSION_CACHE_SIZE = 512
 
 
 class SpotifyClient:
@@ -24,10 +33,22 @@ class SpotifyClient:
         self.logger = get_logger(__name__)
         self._refresh_lock = threading.Lock()
         self._last_refresh_time = 0
+        # (DB.settings_version() it was read at, client_id); any settings write refreshes it,
+        # so every instance (web routes, sync service) sees a changed client_id
+        self._client_id_cache: Optional[Tuple[Optional[int], str]] = None
+        # (kind, id) -> (fetched_at, tracks) for strategy expansion lookups, LRU ordered
+        self._expansion_cache: 'OrderedDict[Tuple[str, str], Tuple[float, List[Dict]]]' = OrderedDict()
+        self._expansion_lock = threading.Lock()
 
     def _client_id(self) -> str:
         # Prefer configured client_id, else env, else empty (requires user to set)
-        return self.db.get_setting('spotify_client_id') or os.environ.get('SPOTIFY_CLIENT_ID', '')
+        version_of = getattr(self.db, 'settings_version', None)
+        version = version_of() if version_of else None
+        cached = self._client_id_cache
+        if cached is None or version is None or cached[0] != version:
+            client_id = self.db.get_setting('spotify_client_id') or os.environ.get('SPOTIFY_CLIENT_ID', '')
+            cached = self._client_id_cache = (version, client_id)
+        return cached[1]
 
     def begin_pkce(self) -> Dict[str, str]:
         verifier = base64.urlsafe_b64encode(os.urandom(64)).decode('utf-8').rstrip('=')
@@ -145,19 +166,90 @@ class SpotifyClient:
                 return access_token
             raise RuntimeError("refresh_failed")
 
-    # Data fetching methods remain same signature used by SyncService
+    def _get_page(self, url: str, headers: Dict[str, str], log: logging.LoggerAdapter,
+                  on_forbidden: Optional[Callable[[requests.Response, logging.LoggerAdapter], None]] = None) -> Dict:
+        """Fetch one page of a paginated listing, refreshing the token or waiting out rate limits.
+
+        on_forbidden maps a 403 to the listing's own error, as the serial path does.
+        """
+        while True:
+            r = requests.get(url, headers=headers, timeout=15)
+            if r.status_code == 401:
+                at = self.refresh_access_token()
+                headers = {"Authorization": f"Bearer {at}"}
+                r = requests.get(url, headers=headers, timeout=15)
+            if r.status_code == 429:
+                retry_after = int(r.headers.get('Retry-After', 60))
+                log.warning(f"Spotify rate limited, waiting {retry_after} seconds")
+                time.sleep(retry_after)
+                continue
+            if r.status_code == 403 and on_forbidden is not None:
+                on_forbidden(r, log)
+            r.raise_for_status()
+            return r.json()
+
+    @staticmethod
+    def _remaining_page_urls(base_url: str, first_page: Dict) -> List[str]:
+        """Offset URLs for every page after the first, or [] when the total is unknown."""
+        total = first_page.get('total')
+        limit = first_page.get('limit')
+        if not isinstance(total, int) or not limit or first_page.get('offset') != 0:
+            return []
+        return [f"{base_url}&offset={offset}" for offset in range(limit, total, limit)]
+
+    def _fetch_pages(self, urls: List[str], headers: Dict[str, str],
+                     on_forbidden: Optional[Callable[[requests.Response, logging.LoggerAdapter], None]] = None) -> Iterator[Dict]:
+        """Fetch pages concurrently, yielding them in the order of urls.
+
+        At most PAGE_PREFETCH_WINDOW requests are outstanding, so a slow consumer does
+        not end up holding every remaining page of a large listing in memory.
+        """
+        log, _ = with_context(self.logger, attempt=1)
+        window: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=PAGE_PREFETCH_WORKERS) as pool:
+            for url in urls:
+                if len(window) >= PAGE_PREFETCH_WINDOW:
+                    yield window.popleft().result()
+                window.append(pool.submit(self._get_page, url, headers, log, on_forbidden))
+            while window:
+                yield window.popleft().result()
+
+    @staticmethod
+    def _parse_track_items(data: Dict) -> Iterator[Dict]:
+        """Yield normalized tracks from a playlist or saved-tracks page."""
+        for it in data.get("items", []):
+            tr = (it or {}).get("track") or {}
+            if not tr or tr.get("is_local"):
+                continue
+            artist_obj = (tr.get("artists") or [{}])[0]
+            album_obj = (tr.get("album") or {})
+            duration_ms = tr.get("duration_ms", 0)
+            yield {
+                "artist": artist_obj.get("name", ""),
+                "artist_id": artist_obj.get("id", ""),
+                "album": album_obj.get("name", ""),
+                "album_id": album_obj.get("id", ""),
+                "title": tr.get("name", ""),
+                "duration": int((duration_ms or 0) // 1000)
+            }
+
+    # Data fetching methods remain same signature used by SyncService; the iter_*
+    # variants yield items page by page so callers need not hold every page at once.
     def current_user_playlists(self) -> List[Dict]:
+        return list(self.iter_current_user_playlists())
+
+    def iter_current_user_playlists(self) -> Iterator[Dict]:
+        log, _ = with_context(self.logger, attempt=1)
         at, _ = self.token_store.load()
         if not at:
             raise RuntimeError("not_authenticated")
         headers = {"Authorization": f"Bearer {at}"}
         url = "https://api.spotify.com/v1/me/playlists?limit=50"
-        items: List[Dict] = []
         while url:
             try:
                 r = requests.get(url, headers=headers, timeout=15)
             except Exception as e:
-                with_context(self.logger, attempt=1)[0].error(f"spotify playlists request error: {e}")
+                log.error(f"spotify playlists request error: {e}")
                 raise
             if r.status_code == 401:
                 try:
@@ -172,27 +264,52 @@ class SpotifyClient:
                         raise
             if r.status_code == 429:
                 retry_after = int(r.headers.get('Retry-After', 60))
-                with_context(self.logger, attempt=1)[0].warning(f"Spotify playlists rate limited, retry in {retry_after} seconds")
+                log.warning(f"Spotify playlists rate limited, retry in {retry_after} seconds")
                 raise RuntimeError(f"rate_limited:{retry_after}")
             r.raise_for_status()
             data = r.json()
             for p in data.get("items", []):
-                items.append({"id": p.get("id"), "name": p.get("name"), "tracks": p.get("tracks", {}).get("total", 0)})
+                yield {"id": p.get("id"), "name": p.get("name"), "tracks": p.get("tracks", {}).get("total", 0)}
             url = data.get("next")
-        return items
 
     def playlist_tracks(self, playlist_id: str) -> List[Dict]:
+        return list(self.iter_playlist_tracks(playlist_id))
+
+    @staticmethod
+    def _raise_playlist_forbidden(r, playlist_id: str, log: logging.LoggerAdapter) -> None:
+        """Convert a 403 on a playlist page into the RuntimeError callers handle."""
+        # Could be insufficient scope, private playlist, etc.
+        try:
+            error_data = r.json()
+            error_msg = error_data.get('error', {}).get('message', 'Access forbidden')
+            reason = error_data.get('error', {}).get('reason', 'unknown')
+        except Exception:
+            error_msg = 'Access forbidden'
+            reason = 'unknown'
+
+        log.error(f"Spotify playlist {playlist_id} forbidden: {error_msg} (reason: {reason})")
+
+        # Convert to RuntimeError with specific message for upstream handling
+        if 'insufficient' in error_msg.lower() or 'scope' in error_msg.lower():
+            raise RuntimeError(f"insufficient_scope_for_playlist:{playlist_id}")
+        elif 'private' in error_msg.lower() or 'owner' in error_msg.lower():
+            raise RuntimeError(f"playlist_access_denied:{playlist_id}")
+        else:
+            raise RuntimeError(f"playlist_forbidden:{playlist_id}:{error_msg}")
+
+    def iter_playlist_tracks(self, playlist_id: str) -> Iterator[Dict]:
+        log, _ = with_context(self.logger, attempt=1)
         at, _ = self.token_store.load()
         if not at:
             raise RuntimeError("not_authenticated")
         headers = {"Authorization": f"Bearer {at}"}
-        url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks?additional_types=track&limit=100&market=from_token"
-        items: List[Dict] = []
+        base_url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks?additional_types=track&limit=100&market=from_token"
+        url = base_url
         while url:
             try:
                 r = requests.get(url, headers=headers, timeout=15)
             except Exception as e:
-                with_context(self.logger, attempt=1)[0].error(f"spotify playlist items error: {e}")
+                log.error(f"spotify playlist items error: {e}")
                 raise
             if r.status_code == 401:
                 try:
@@ -208,60 +325,51 @@ class SpotifyClient:
             if r.status_code == 429:
                 # Rate limited - check Retry-After header
                 retry_after = int(r.headers.get('Retry-After', 60))
-                with_context(self.logger, attempt=1)[0].warning(f"Spotify rate limited, waiting {retry_after} seconds")
+                log.warning(f"Spotify rate limited, waiting {retry_after} seconds")
                 time.sleep(retry_after)
                 continue
             if r.status_code == 403:
-                # Handle 403 Forbidden - could be insufficient scope, private playlist, etc.
-                try:
-                    error_data = r.json()
-                    error_msg = error_data.get('error', {}).get('message', 'Access forbidden')
-                    reason = error_data.get('error', {}).get('reason', 'unknown')
-                except Exception:
-                    error_msg = 'Access forbidden'
-                    reason = 'unknown'
-
-                with_context(self.logger, attempt=1)[0].error(f"Spotify playlist {playlist_id} forbidden: {error_msg} (reason: {reason})")
-
-                # Convert to RuntimeError with specific message for upstream handling
-                if 'insufficient' in error_msg.lower() or 'scope' in error_msg.lower():
-                    raise RuntimeError(f"insufficient_scope_for_playlist:{playlist_id}")
-                elif 'private' in error_msg.lower() or 'owner' in error_msg.lower():
-                    raise RuntimeError(f"playlist_access_denied:{playlist_id}")
-                else:
-                    raise RuntimeError(f"playlist_forbidden:{playlist_id}:{error_msg}")
+                self._raise_playlist_forbidden(r, playlist_id, log)
             r.raise_for_status()
             data = r.json()
-            for it in data.get("items", []):
-                tr = (it or {}).get("track") or {}
-                if not tr or tr.get("is_local"):
-                    continue
-                artist_obj = (tr.get("artists") or [{}])[0]
-                artist = artist_obj.get("name", "")
-                artist_id = artist_obj.get("id", "")
-                album_obj = (tr.get("album") or {})
-                album = album_obj.get("name", "")
-                album_id = album_obj.get("id", "")
-                title = tr.get("name", "")
-                duration_ms = tr.get("duration_ms", 0)
-                items.append({
-                    "artist": artist,
-                    "artist_id": artist_id,
-                    "album": album,
-                    "album_id": album_id,
-                    "title": title,
-                    "duration": int((duration_ms or 0) // 1000)
-                })
+            yield from self._parse_track_items(data)
             url = data.get("next")
-        return items
+            remaining = self._remaining_page_urls(base_url, data) if url else []
+            if remaining:
+                # Total is known after the first page: fetch the rest concurrently
+                def forbidden(resp, page_log):
+                    self._raise_playlist_forbidden(resp, playlist_id, page_log)
+                for page in self._fetch_pages(remaining, headers, on_forbidden=forbidden):
+                    yield from self._parse_track_items(page)
+                url = None
+
+    def _cached_tracks(self, kind: str, item_id: str, fetch: Callable[[str], Iterator[Dict]]) -> List[Dict]:
+        """Return fetch(item_id) as a list, reusing results younger than EXPANSION_CACHE_TTL."""
+        key = (kind, item_id)
+        now = time.monotonic()
+        with self._expansion_lock:
+            hit = self._expansion_cache.get(key)
+            if hit is not None and now - hit[0] < EXPANSION_CACHE_TTL:
+                self._expansion_cache.move_to_end(key)
+                return [dict(t) for t in hit[1]]
+        tracks = list(fetch(item_id))
+        with self._expansion_lock:
+            self._expansion_cache[key] = (now, tracks)
+            self._expansion_cache.move_to_end(key)
+            while len(self._expansion_cache) > EXPANSION_CACHE_SIZE:
+                self._expansion_cache.popitem(last=False)
+        # Callers tag and store these dicts; keep the cached copies pristine
+        return [dict(t) for t in tracks]
 
     def artist_all_tracks(self, artist_id: str) -> List[Dict]:
+        return self._cached_tracks('artist', artist_id, self.iter_artist_all_tracks)
+
+    def iter_artist_all_tracks(self, artist_id: str) -> Iterator[Dict]:
         at, _ = self.token_store.load()
         if not at:
             raise RuntimeError("not_authenticated")
         headers = {"Authorization": f"Bearer {at}"}
         # Get albums, then tracks
-        items: List[Dict] = []
         url = f"https://api.spotify.com/v1/artists/{artist_id}/albums?include_groups=album,single&limit=50"
         albums = []
         while url:
@@ -282,16 +390,18 @@ class SpotifyClient:
             albums.extend([a.get('id') for a in data.get('items', []) if a.get('id')])
             url = data.get('next')
         for aid in albums:
-            items.extend(self.album_tracks(aid))
-        return items
+            yield from self.iter_album_tracks(aid)
 
     def album_tracks(self, album_id: str) -> List[Dict]:
+        return self._cached_tracks('album', album_id, self.iter_album_tracks)
+
+    def iter_album_tracks(self, album_id: str) -> Iterator[Dict]:
         at, _ = self.token_store.load()
         if not at:
             raise RuntimeError("not_authenticated")
         headers = {"Authorization": f"Bearer {at}"}
-        url = f"https://api.spotify.com/v1/albums/{album_id}/tracks?limit=50&market=from_token"
-        out: List[Dict] = []
+        base_url = f"https://api.spotify.com/v1/albums/{album_id}/tracks?limit=50&market=from_token"
+        url = base_url
         album_name = None
         # fetch album name
         r0 = requests.get(f"https://api.spotify.com/v1/albums/{album_id}?market=from_token", headers=headers, timeout=15)
@@ -322,31 +432,40 @@ class SpotifyClient:
                         raise
             r.raise_for_status()
             data = r.json()
-            for tr in data.get('items', []):
-                artist_obj = (tr.get("artists") or [{}])[0]
-                out.append({
-                    "artist": artist_obj.get('name',''),
-                    "artist_id": artist_obj.get('id',''),
-                    "album": album_name or '',
-                    "album_id": album_id,
-                    "title": tr.get('name',''),
-                    "duration": int((tr.get('duration_ms',0) or 0)//1000)
-                })
+            pages = [data]
             url = data.get('next')
-        return out
+            remaining = self._remaining_page_urls(base_url, data) if url else []
+            if remaining:
+                # Total is known after the first page: fetch the rest concurrently
+                pages = itertools.chain(pages, self._fetch_pages(remaining, headers))
+                url = None
+            for page in pages:
+                for tr in page.get('items', []):
+                    artist_obj = (tr.get("artists") or [{}])[0]
+                    yield {
+                        "artist": artist_obj.get('name',''),
+                        "artist_id": artist_obj.get('id',''),
+                        "album": album_name or '',
+                        "album_id": album_id,
+                        "title": tr.get('name',''),
+                        "duration": int((tr.get('duration_ms',0) or 0)//1000)
+                    }
 
     def user_saved_tracks(self) -> List[Dict]:
+        return list(self.iter_user_saved_tracks())
+
+    def iter_user_saved_tracks(self) -> Iterator[Dict]:
+        log, _ = with_context(self.logger, attempt=1)
         at, _ = self.token_store.load()
         if not at:
             raise RuntimeError("not_authenticated")
         headers = {"Authorization": f"Bearer {at}"}
         url = "https://api.spotify.com/v1/me/tracks?limit=50&market=from_token"
-        items: List[Dict] = []
         while url:
             try:
                 r = requests.get(url, headers=headers, timeout=15)
             except Exception as e:
-                with_context(self.logger, attempt=1)[0].error(f"spotify liked tracks request error: {e}")
+                log.error(f"spotify liked tracks request error: {e}")
                 raise
             if r.status_code == 401:
                 try:
@@ -361,7 +480,7 @@ class SpotifyClient:
                         raise
             if r.status_code == 429:
                 retry_after = int(r.headers.get('Retry-After', 60))
-                with_context(self.logger, attempt=1)[0].warning(f"Spotify liked tracks rate limited, retry in {retry_after} seconds")
+                log.warning(f"Spotify liked tracks rate limited, retry in {retry_after} seconds")
                 raise RuntimeError(f"rate_limited:{retry_after}")
             if r.status_code == 403:
                 # Handle 403 Forbidden - could be insufficient scope, private content, etc.
@@ -373,7 +492,7 @@ class SpotifyClient:
                     error_msg = 'Access forbidden'
                     reason = 'unknown'
 
-                with_context(self.logger, attempt=1)[0].error(f"Spotify liked tracks forbidden: {error_msg} (reason: {reason})")
+                log.error(f"Spotify liked tracks forbidden: {error_msg} (reason: {reason})")
 
                 # Convert to RuntimeError with specific message for upstream handling
                 if 'insufficient' in error_msg.lower() or 'scope' in error_msg.lower():
@@ -384,25 +503,5 @@ class SpotifyClient:
                     raise RuntimeError(f"liked_songs_forbidden:{error_msg}")
             r.raise_for_status()
             data = r.json()
-            for it in data.get("items", []):
-                tr = (it or {}).get("track") or {}
-                if not tr or tr.get("is_local"):
-                    continue
-                artist_obj = (tr.get("artists") or [{}])[0]
-                artist = artist_obj.get("name", "")
-                artist_id = artist_obj.get("id", "")
-                album_obj = (tr.get("album") or {})
-                album = album_obj.get("name", "")
-                album_id = album_obj.get("id", "")
-                title = tr.get("name", "")
-                duration_ms = tr.get("duration_ms", 0)
-                items.append({
-                    "artist": artist,
-                    "artist_id": artist_id,
-                    "album": album,
-                    "album_id": album_id,
-                    "title": title,
-                    "duration": int((duration_ms or 0) // 1000)
-                })
+            yield from self._parse_track_items(data)
             url = data.get("next")
-        return items
@@ -1,7 +1,17 @@
-from typing import Dict, List, Callable, Optional
-from threading import Lock
+import json
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Callable, Optional
+from threading import Event, Lock, Timer
 from datetime import datetime, timezone
 
+from youspotter.queue import identity_key
+
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # pragma: no cover
+    _orjson = None
+
 _lock = Lock()
 _state = {
     "missing": 0,
@@ -18,93 +28,325 @@ _state = {
     },
 }
 
+_COUNTERS = ("missing", "downloading", "downloaded", "songs", "artists", "albums")
+_RECENT_LIMIT = 50
+# Completed queue history kept in (and persisted with) the status snapshot
+_COMPLETED_LIMIT = 500
+
+# add_recent() appends here without taking _lock; readers and a short flush timer
+# drain the buffer into _state["recent"] (newest first).
+_recent_buffer: deque = deque(maxlen=500)
+_flush_pending = Event()
+# Set when drained lines reached _state["recent"] but no snapshot has persisted them yet
+# (e.g. get_status() drained them); the flush timer snapshots whenever it is set
+_recent_dirty = False
+_FLUSH_DELAY = 0.5
+
+# Queue items carry their identity key under this field so scans compare strings
+# instead of re-normalizing artist/title on every mutation. Catalog rows already
+# carry the key computed at sync time as "identity", which is reused when present.
+_ID_KEY = "__id_key__"
+
 _persist_save: Optional[Callable[[Dict], None]] = None
 _persist_load: Optional[Callable[[], Optional[Dict]]] = None
+# Optional append-only writer for small delta events (e.g. progress ticks); the next
+# full snapshot supersedes them, and the loader replays them with apply_patch().
+_persist_patch: Optional[Callable[[Dict], None]] = None
+
+# Snapshots are taken under _lock but written outside it; the sequence number keeps
+# a slow writer from overwriting a newer snapshot with an older one.
+_persist_lock = Lock()
+_snapshot_seq = 0
+_persisted_seq = 0
+
+
+# Timestamps are only shown at second resolution, so format them once per second.
+# The cache is a single tuple so lock-free callers never see a half-updated entry.
+_ts_cache: tuple[int, str, str] = (-1, "", "")
+
+
+def _now_strings() -> tuple[str, str]:
+    """Return (ISO-8601, HH:MM:SS) UTC strings for the current second."""
+    global _ts_cache
+    sec = int(time.time())
+    cached = _ts_cache
+    if sec != cached[0]:
+        now = datetime.fromtimestamp(sec, timezone.utc)
+        cached = (sec, now.isoformat(), now.strftime("%H:%M:%S"))
+        _ts_cache = cached
+    return cached[1], cached[2]
+
+
+def now_iso() -> str:
+    """Current UTC time as ISO-8601 at second resolution, shared with the status log."""
+    return _now_strings()[0]
+
+
+def _keyed(item: Dict) -> Dict:
+    """Return item with its identity key attached, copying only when the key is missing.
+
+    Catalog rows already carry "identity", so they are stored without a copy.
+    """
+    if _ID_KEY in item or item.get("identity"):
+        return item
+    it = dict(item)
+    it[_ID_KEY] = identity_key(item)
+    return it
+
+
+def queue_item(item: Dict) -> Dict:
+    """Tag item with its queue identity key once, for callers that pass it repeatedly."""
+    return _keyed(item)
+
+
+def _key_of(item: Dict) -> str:
+    return item.get(_ID_KEY) or item.get("identity") or identity_key(item)
+
+
+def _drain_recent() -> bool:
+    """Move buffered log lines into _state["recent"]; must be called with _lock held."""
+    global _recent_dirty
+    batch = []
+    while True:
+        try:
+            batch.append(_recent_buffer.pop())  # oldest first
+        except IndexError:
+            break
+    if not batch:
+        return False
+    limit = min(entry[1] for entry in batch)
+    batch.reverse()
+    _state["recent"] = ([entry[0] for entry in batch] + _state["recent"])[:limit]
+    _recent_dirty = True
+    return True
+
+
+def _flush_recent():
+    _flush_pending.clear()
+    with _lock:
+        _drain_recent()
+        snapshot = _snapshot() if _recent_dirty else None
+    _persist(snapshot)
+
+
+def _schedule_flush():
+    if _flush_pending.is_set():
+        return
+    _flush_pending.set()
+    timer = Timer(_FLUSH_DELAY, _flush_recent)
+    timer.daemon = True
+    timer.start()
+
+
+def _public_queue() -> Dict[str, List[Dict]]:
+    """Copy of the queue sections with cached identity keys stripped; call with _lock held."""
+    return {
+        name: [{k: v for k, v in it.items() if k != _ID_KEY} if _ID_KEY in it else it for it in items]
+        for name, items in _state["queue"].items()
+    }
+
+
+def _snapshot() -> Optional[tuple[int, Dict]]:
+    """Copy of the state for persistence, with cached identity keys stripped.
+
+    Must be called with _lock held. Returns None when no persistence is registered.
+    """
+    global _snapshot_seq, _recent_dirty
+    _drain_recent()
+    if not _persist_save:
+        return None
+    _recent_dirty = False
+    snap = dict(_state)
+    snap["recent"] = list(_state["recent"])
+    snap["queue"] = _public_queue()
+    _snapshot_seq += 1
+    return _snapshot_seq, snap
+
+
+def _patch(event: Dict) -> Optional[tuple[int, Dict]]:
+    """Tag a delta event with the snapshot it applies on top of; call with _lock held."""
+    if not _persist_patch:
+        return None
+    return _snapshot_seq, event
+
+
+def _persist(snapshot: Optional[tuple[int, Dict]]):
+    """Write a snapshot taken by _snapshot(); call without holding _lock."""
+    global _persisted_seq
+    if snapshot is None or not _persist_save:
+        return
+    seq, payload = snapshot
+    with _persist_lock:
+        if seq <= _persisted_seq:
+            return
+        _persisted_seq = seq
+        _persist_save(payload)
+
+
+def _persist_event(event: Optional[tuple[int, Dict]]):
+    """Write a delta event tagged by _patch(); call without holding _lock.
+
+    Events only extend the snapshot they were taken on. If a newer snapshot is already
+    written it includes the change; if their own snapshot is still unwritten, its write
+    clears the events anyway. Either way the event is dropped, and it never advances
+    _persisted_seq, so it cannot cause a snapshot to be skipped.
+    """
+    if event is None or not _persist_patch:
+        return
+    base_seq, payload = event
+    with _persist_lock:
+        if base_seq == _persisted_seq:
+            _persist_patch(payload)
+
+
+def apply_patch(state: Dict, event: Dict) -> None:
+    """Replay a persisted delta event onto a loaded snapshot."""
+    if event.get("op") == "progress":
+        for c in (state.get("queue") or {}).get("current", []):
+            if _key_of(c) == event.get("key"):
+                c["progress"] = int(event.get("pct") or 0)
+                break
+
+def encode_snapshot(data: Dict) -> str:
+    """Serialize a persisted snapshot, using orjson when it is installed."""
+    if _orjson is not None:
+        return _orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+
+def decode_snapshot(raw: str) -> Optional[Dict]:
+    if not raw:
+        return None
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
 
 def get_status() -> Dict:
     with _lock:
-        return dict(_state)
+        _drain_recent()
+        state = dict(_state)
+        state["queue"] = _public_queue()
+        return state
 
 def set_status(counts: Dict):
     with _lock:
         _state.update(counts)
-        if _persist_save:
-            _persist_save(dict(_state))
+        snapshot = _snapshot()
+    _persist(snapshot)
 
 def set_totals(songs: int, artists: int, albums: int):
     with _lock:
         _state["songs"] = int(songs)
         _state["artists"] = int(artists)
         _state["albums"] = int(albums)
-        if _persist_save:
-            _persist_save(dict(_state))
+        snapshot = _snapshot()
+    _persist(snapshot)
 
-def add_recent(message: str, level: str = "INFO", limit: int = 50):
+def set_counts_and_queue(counts: Dict, pending: List[Dict]):
+    """Update counters and the pending queue together, persisting a single snapshot."""
     with _lock:
-        timestamp = datetime.now(timezone.utc).strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {level}: {message}"
-        _state["recent"].insert(0, formatted_message)
-        if len(_state["recent"]) > limit:
-            _state["recent"] = _state["recent"][:limit]
-        if _persist_save:
-            _persist_save(dict(_state))
-
-def set_queue(pending: List[Dict]):
+        for key in _COUNTERS:
+            if key in counts:
+                _state[key] = int(counts[key] or 0)
+        _state["queue"]["pending"] = [_keyed(p) for p in pending]
+        snapshot = _snapshot()
+    _persist(snapshot)
+
+def add_recent(message: str, level: str = "INFO", limit: int = _RECENT_LIMIT):
+    timestamp = _now_strings()[1]
+    _recent_buffer.appendleft((f"[{timestamp}] {level}: {message}", limit))
+    _schedule_flush()
+
+def set_queue(pending: Iterable[Dict]):
     with _lock:
-        _state["queue"]["pending"] = list(pending)
-        if _persist_save:
-            _persist_save(dict(_state))
+        _state["queue"]["pending"] = [_keyed(p) for p in pending]
+        snapshot = _snapshot()
+    _persist(snapshot)
 
 def queue_move_to_current(item: Dict):
     with _lock:
-        from youspotter.queue import identity_key
         it = dict(item)
         it.setdefault('progress', 0)
+        item_key = it[_ID_KEY] = _key_of(it)
         _state["queue"]["current"].append(it)
-        # remove from pending if present using identity key matching
-        item_key = identity_key(item)
-        _state["queue"]["pending"] = [p for p in _state["queue"]["pending"] if identity_key(p) != item_key]
-        if _persist_save:
-            _persist_save(dict(_state))
+        # remove from pending if present using identity key matching. Pending is unique
+        # by identity and the worker takes its head, so that case is a slice, not a scan.
+        pending = _state["queue"]["pending"]
+        if pending and _key_of(pending[0]) == item_key:
+            _state["queue"]["pending"] = pending[1:]
+        else:
+            _state["queue"]["pending"] = [p for p in pending if _key_of(p) != item_key]
+        snapshot = _snapshot()
+    _persist(snapshot)
 
 def queue_complete(item: Dict, ok: bool):
     with _lock:
-        from youspotter.queue import identity_key
         # remove from current using identity key matching
-        item_key = identity_key(item)
-        _state["queue"]["current"] = [c for c in _state["queue"]["current"] if identity_key(c) != item_key]
+        item_key = _key_of(item)
+        _state["queue"]["current"] = [c for c in _state["queue"]["current"] if _key_of(c) != item_key]
         rec = dict(item)
+        rec[_ID_KEY] = item_key
         rec["status"] = "downloaded" if ok else "missing"
-        rec["timestamp"] = datetime.now(timezone.utc).isoformat()
-        _state["queue"]["completed"].insert(0, rec)
-        if _persist_save:
-            _persist_save(dict(_state))
+        rec["timestamp"] = _now_strings()[0]
+        _state["queue"]["completed"] = [rec] + _state["queue"]["completed"][:_COMPLETED_LIMIT - 1]
+        snapshot = _snapshot()
+    _persist(snapshot)
 
 def queue_update_progress(item: Dict, percent: int):
     with _lock:
-        from youspotter.queue import identity_key
-        item_key = identity_key(item)
+        item_key = _key_of(item)
         for c in _state["queue"].get("current", []):
-            if identity_key(c) == item_key:
+            if _key_of(c) == item_key:
                 c['progress'] = int(percent)
                 break
-        if _persist_save:
-            _persist_save(dict(_state))
+        else:
+            # Nothing in "current" changed, so there is nothing to persist
+            return
+        if _persist_patch:
+            event = _patch({"op": "progress", "key": item_key, "pct": int(percent)})
+            snapshot = None
+        else:
+            event = None
+            snapshot = _snapshot()
+    _persist_event(event)
+    _persist(snapshot)
 
-def register_persistence(load_fn: Callable[[], Optional[Dict]], save_fn: Callable[[Dict], None]):
-    global _persist_load, _persist_save
+def register_persistence(
+    load_fn: Callable[[], Optional[Dict]],
+    save_fn: Callable[[Dict], None],
+    patch_fn: Optional[Callable[[Dict], None]] = None,
+):
+    global _persist_load, _persist_save, _persist_patch
     _persist_load = load_fn
     _persist_save = save_fn
+    _persist_patch = patch_fn
     # Attempt initial load
     if _persist_load:
         data = _persist_load() or None
         if isinstance(data, dict):
             with _lock:
-                _state.update({k: data.get(k, _state.get(k)) for k in _state.keys()})
+                _merge(data)
 
 def load_state(data: Dict):
     with _lock:
-        _state.update(data)
+        _merge(data)
+
+def _merge(data: Dict):
+    """Merge a loaded snapshot into _state key by key; must be called with _lock held.
+
+    Only known keys are taken, and the queue sections are replaced individually so a
+    partial snapshot cannot drop a section the rest of the module relies on.
+    """
+    for key in _COUNTERS:
+        if key in data:
+            _state[key] = int(data[key] or 0)
+    if "recent" in data:
+        _state["recent"] = list(data["recent"] or [])[:_RECENT_LIMIT]
+    queue = data.get("queue")
+    if isinstance(queue, dict):
+        for name, items in queue.items():
+            if name in _state["queue"]:
+                _state["queue"][name] = list(items or [])
 
 def reset_false_completions():
     """Reset false completed items back to pending queue - fixes threading bug aftermath"""
@@ -116,20 +358,23 @@ def reset_false_completions():
 
         # Add failed items back to pending queue
         existing_pending = _state["queue"]["pending"]
+        pending_keys = {_key_of(p) for p in existing_pending}
         for item in failed_items:
             # Remove status and timestamp to return to original format
-            clean_item = {k: v for k, v in item.items() if k not in ["status", "timestamp"]}
-            if clean_item not in existing_pending:
+            clean_item = _keyed({k: v for k, v in item.items() if k not in ["status", "timestamp"]})
+            clean_key = _key_of(clean_item)
+            if clean_key not in pending_keys:
                 existing_pending.append(clean_item)
+                pending_keys.add(clean_key)
 
         # Keep only actual downloads in completed queue
         _state["queue"]["completed"] = actual_downloads
 
         # Persist the changes
-        if _persist_save:
-            _persist_save(dict(_state))
+        snapshot = _snapshot()
+    _persist(snapshot)
 
-        return len(failed_items), len(actual_downloads)
+    return len(failed_items), len(actual_downloads)
 
 def cleanup_startup_state():
     """Clean up stale download state on app startup"""
@@ -139,11 +384,14 @@ def cleanup_startup_state():
         if current_items:
             # Add current items back to pending queue
             existing_pending = _state["queue"]["pending"]
+            pending_keys = {_key_of(p) for p in existing_pending}
             for item in current_items:
                 # Remove progress and any download-specific fields
-                clean_item = {k: v for k, v in item.items() if k not in ["progress", "status", "timestamp"]}
-                if clean_item not in existing_pending:
+                clean_item = _keyed({k: v for k, v in item.items() if k not in ["progress", "status", "timestamp"]})
+                clean_key = _key_of(clean_item)
+                if clean_key not in pending_keys:
                     existing_pending.append(clean_item)
+                    pending_keys.add(clean_key)
 
         # Clear current queue and reset downloading count
         _state["queue"]["current"] = []
@@ -158,7 +406,19 @@ def cleanup_startup_state():
         _state["missing"] = missing_count
 
         # Persist the cleaned state
-        if _persist_save:
-            _persist_save(dict(_state))
+        snapshot = _snapshot()
+    _persist(snapshot)
+
+    return len(current_items)
 
-        return len(current_items)
+def fail_current_items() -> int:
+    """Move stale "current" items to completed as missing; returns how many were moved."""
+    with _lock:
+        current_items = _state["queue"]["current"]
+        timestamp = _now_strings()[0]
+        stale = [dict(item, status="missing", timestamp=timestamp) for item in reversed(current_items)]
+        _state["queue"]["current"] = []
+        _state["queue"]["completed"] = (stale + _state["queue"]["completed"])[:_COMPLETED_LIMIT]
+        snapshot = _snapshot()
+    _persist(snapshot)
+    return len(current_items)
@@ -1,34 +1,298 @@
+import atexit
+import hashlib
 import logging
 import os
+import queue
 import sqlite3
 import threading
 import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import keyring  # type: ignore
+except Exception:  # pragma: no cover
+    keyring = None
 
 logger = logging.getLogger(__name__)
 
+# journal_mode persists in the database file; the rest are per-connection settings.
+CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA busy_timeout=5000;
+PRAGMA wal_autocheckpoint=1000;
+"""
+
+# Upper bound on pooled connections per DB (the batched writer has its own)
+CONNECTION_POOL_SIZE = max(4, os.cpu_count() or 1)
+
+# Prepared statements kept per connection (sqlite3 defaults to 100)
+STATEMENT_CACHE_SIZE = 256
+
+# Secondary indexes on tracks; upsert_tracks drops and rebuilds them around a large
+# initial load, where building once is cheaper than maintaining them per row.
+# The idx_tracks_queue column order lets select_tracks_for_queue walk rows in
+# last_seen order with retry_after checked from the index (no temp b-tree sort).
+TRACK_INDEXES = (
+    ("idx_tracks_queue", "CREATE INDEX IF NOT EXISTS idx_tracks_queue ON tracks(status, last_seen, retry_after)"),
+    ("idx_tracks_retry", "CREATE INDEX IF NOT EXISTS idx_tracks_retry ON tracks(retry_after)"),
+    # Covering indexes so the catalog GROUP BYs stream in index order instead of building
+    # a temp b-tree; binary collation to match the GROUP BY (only the small grouped
+    # result is re-sorted NOCASE). The album index is partial, matching the query's WHERE.
+    ("idx_tracks_artist", "CREATE INDEX IF NOT EXISTS idx_tracks_artist ON tracks(artist)"),
+    ("idx_tracks_album_artist",
+     "CREATE INDEX IF NOT EXISTS idx_tracks_album_artist ON tracks(album, artist) "
+     "WHERE album IS NOT NULL AND album != ''"),
+)
+BULK_LOAD_MIN_ROWS = 5000
+
+# Small writes are queued and committed together by a writer thread
+WRITE_COALESCE_WINDOW = 0.05  # seconds to keep collecting after the first queued write
+WRITE_BATCH_MAX = 500
+# flush() gives up waiting after this long instead of blocking readers forever
+WRITE_FLUSH_TIMEOUT = 30.0
+
+
+@lru_cache(maxsize=65536)
+def _stable_id(prefix: str, name: str) -> str:
+    """Catalog ID derived from the name; unlike hash(), it is the same across restarts."""
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{prefix}_{digest}"
+
+
+class _WriteCoalescer:
+    """Commits queued (sql, params[, on_error]) writes in batches on a daemon thread.
+
+    A batch whose commit fails is retried one write per transaction. Writes that still
+    fail call their on_error(exc) and are kept for the next flush() to report.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._q: "queue.Queue[object]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._errors: "deque[Exception]" = deque(maxlen=100)
+
+    def pending(self) -> bool:
+        return self._q.unfinished_tasks > 0
+
+    def _ensure_thread(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._thread is not None:
+                logger.error("write queue thread died; restarting it")
+            else:
+                atexit.register(self.flush)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def put(self, op: Tuple):
+        if self._thread is None or not self._thread.is_alive():
+            self._ensure_thread()
+        self._q.put(op)
+
+    def flush(self, timeout: float = WRITE_FLUSH_TIMEOUT, take_errors: bool = True) -> List[Exception]:
+        """Wait for queued writes; returns (and forgets) failures not yet reported."""
+        if self._thread is not None:
+            barrier = threading.Event()
+            self._q.put(barrier)
+            deadline = time.monotonic() + timeout
+            while not barrier.wait(0.5):
+                if not self._thread.is_alive():
+                    self._ensure_thread()
+                if time.monotonic() >= deadline:
+                    logger.error(f"timed out after {timeout}s waiting for queued writes")
+                    break
+        errors = []
+        while take_errors and self._errors:
+            errors.append(self._errors.popleft())
+        return errors
+
+    def _run(self):
+        conn = None
+        while True:
+            batch = [self._q.get()]
+            deadline = time.monotonic() + WRITE_COALESCE_WINDOW
+            # Keep collecting until the window closes, the batch is full or a flush is requested
+            while len(batch) < WRITE_BATCH_MAX and not isinstance(batch[-1], threading.Event):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            writes = [op for op in batch if not isinstance(op, threading.Event)]
+            try:
+                if conn is None:
+                    conn = sqlite3.connect(str(self.path), cached_statements=STATEMENT_CACHE_SIZE)
+                    conn.executescript(CONNECTION_PRAGMAS)
+                failed = self._commit(conn, writes)
+            except Exception as exc:
+                # e.g. the database could not be opened; reconnect on the next batch
+                failed = [(op, exc) for op in writes]
+                conn = None
+            # Failures (and their cache rollbacks) are handled before any waiter is released
+            for op, exc in failed:
+                self._report(op, exc)
+            for op in batch:
+                if isinstance(op, threading.Event):
+                    op.set()
+                self._q.task_done()
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection, writes: List[Tuple]) -> List[Tuple[Tuple, Exception]]:
+        failed = []
+        try:
+            for op in writes:
+                try:
+                    conn.execute(op[0], op[1])
+                except Exception as exc:
+                    failed.append((op, exc))
+            conn.commit()
+            return failed
+        except sqlite3.Error as exc:
+            logger.error(f"queued write batch failed to commit, retrying writes one by one: {exc}")
+            conn.rollback()
+        failed = []
+        for op in writes:
+            try:
+                conn.execute(op[0], op[1])
+                conn.commit()
+            except Exception as exc:
+                conn.rollback()
+                failed.append((op, exc))
+        return failed
+
+    def _report(self, op: Tuple, exc: Exception):
+        logger.error(f"queued write failed: {exc}")
+        self._errors.append(exc)
+        on_error = op[2] if len(op) > 2 else None
+        if on_error is not None:
+            try:
+                on_error(exc)
+            except Exception as cb_exc:
+                logger.error(f"queued write failure handler raised: {cb_exc}")
+
+
+_writers: Dict[str, _WriteCoalescer] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer_for(path: Path) -> _WriteCoalescer:
+    key = os.path.abspath(str(path))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = _WriteCoalescer(path)
+        return writer
+
+
+class _ReadCache:
+    """Per-file cache of settings/kvstore values, updated by the DB write paths."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.settings: Dict[str, Optional[str]] = {}
+        self.kv: Dict[str, Optional[str]] = {}
+        # Bumped on every settings write so callers can cache values derived from them
+        self.settings_version = 0
+
+
+_read_caches: Dict[str, _ReadCache] = {}
+
+
+def _read_cache_for(path: Path) -> _ReadCache:
+    key = os.path.abspath(str(path))
+    with _writers_lock:
+        cache = _read_caches.get(key)
+        if cache is None:
+            cache = _read_caches[key] = _ReadCache()
+        return cache
+
 
 class DB:
     def __init__(self, path: Path):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        # Use thread-local connections to prevent deadlocks
-        self._local = threading.local()
+        # Bounded pool of connections; LIFO reuse keeps the warmest page cache in play
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._pool_size = CONNECTION_POOL_SIZE
+        self._pool_created = 0
         self._global_lock = threading.Lock()
-        # Initialize the primary connection for migration
+        # One writer per database file, so every DB instance on it reads its own writes
+        self._writer = _writer_for(self.path)
+        self._cache = _read_cache_for(self.path)
+        # Migrate on the first pooled connection and keep it, so the first request
+        # after startup does not pay for connect + PRAGMAs + schema load
         with self._global_lock:
-            conn = sqlite3.connect(str(self.path))
-            conn.execute("PRAGMA journal_mode=WAL;")
+            conn = self._open_connection()
             self._migrate(conn)
-            conn.close()
+            self._pool_created = 1
+            self._pool.put(conn)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, but only one thread uses each at a time
+        conn = sqlite3.connect(
+            str(self.path), cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False
+        )
+        conn.executescript(CONNECTION_PRAGMAS)
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._global_lock:
+            create = self._pool_created < self._pool_size
+            if create:
+                self._pool_created += 1
+        if not create:
+            return self._pool.get()
+        return self._open_connection()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection.
+
+        Queued writes are flushed first so callers always read their own writes.
+        """
+        if self._writer.pending():
+            # Failures stay queued for DB.flush(); readers only need the writes settled
+            self._writer.flush(take_errors=False)
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def _enqueue_write(self, sql: str, params: Tuple, on_error=None):
+        """Queue a write for the shared writer thread, which commits writes in batches.
 
-    def _get_connection(self):
-        """Get thread-local database connection"""
-        if not hasattr(self._local, 'conn') or self._local.conn is None:
-            self._local.conn = sqlite3.connect(str(self.path))
-            self._local.conn.execute("PRAGMA journal_mode=WAL;")
-        return self._local.conn
+        on_error(exc) runs on the writer thread if the write ultimately fails.
+        """
+        self._writer.put((sql, params, on_error))
+
+    def flush(self):
+        """Block until every write queued so far has been committed.
+
+        Raises the last failure among queued writes not reported by an earlier flush().
+        """
+        errors = self._writer.flush()
+        if errors:
+            raise errors[-1]
 
     def _ensure_column(self, conn: sqlite3.Connection, table: str, column: str, definition: str):
         cur = conn.execute(f"PRAGMA table_info({table})")
@@ -54,6 +318,14 @@ class DB:
             );
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS status_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event TEXT NOT NULL
+            );
+            """
+        )
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS tracks (
@@ -78,97 +350,149 @@ class DB:
         self._ensure_column(conn, 'tracks', 'download_attempts', 'INTEGER')
         conn.execute("UPDATE tracks SET download_attempts=0 WHERE download_attempts IS NULL")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_tracks_identity ON tracks(identity)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_tracks_status ON tracks(status)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_tracks_retry ON tracks(retry_after)")
+        # idx_tracks_queue supersedes the old single-column status index
+        conn.execute("DROP INDEX IF EXISTS idx_tracks_status")
+        for _, ddl in TRACK_INDEXES:
+            conn.execute(ddl)
         conn.commit()
 
     def set_setting(self, key: str, value: str):
-        conn = self._get_connection()
-        conn.execute(
-            "INSERT INTO settings(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-            (key, value),
-        )
-        conn.commit()
+        with self._cache.lock:
+            # Unchanged values (e.g. a config form saved as-is) skip the write entirely
+            if key in self._cache.settings and self._cache.settings[key] == value:
+                return
+            self._enqueue_write(
+                "INSERT INTO settings(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, value),
+                lambda _exc: self._forget_cached(self._cache.settings, key, value, settings=True),
+            )
+            self._cache.settings[key] = value
+            self._cache.settings_version += 1
+
+    def _forget_cached(self, cache: Dict, key: str, value: str, settings: bool = False):
+        """Drop a cached value whose write failed, so the next read comes from the DB."""
+        with self._cache.lock:
+            if key in cache and cache[key] == value:
+                del cache[key]
+                if settings:
+                    self._cache.settings_version += 1
+
+    def settings_version(self) -> int:
+        """Counter that changes whenever a setting is written through this file's DB."""
+        return self._cache.settings_version
 
     def get_setting(self, key: str) -> Optional[str]:
-        conn = self._get_connection()
-        cur = conn.execute("SELECT value FROM settings WHERE key=?", (key,))
-        row = cur.fetchone()
-        return row[0] if row else None
+        with self._cache.lock:
+            if key in self._cache.settings:
+                return self._cache.settings[key]
+        with self.connection() as conn:
+            row = conn.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
+        value = row[0] if row else None
+        with self._cache.lock:
+            # A concurrent set_setting wins over the value we just read
+            return self._cache.settings.setdefault(key, value)
 
     def set_kv(self, key: str, value: str):
-        conn = self._get_connection()
-        conn.execute(
-            "INSERT INTO kvstore(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-            (key, value),
-        )
-        conn.commit()
+        with self._cache.lock:
+            if key in self._cache.kv and self._cache.kv[key] == value:
+                return
+            self._enqueue_write(
+                "INSERT INTO kvstore(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, value),
+                lambda _exc: self._forget_cached(self._cache.kv, key, value),
+            )
+            self._cache.kv[key] = value
 
     def get_kv(self, key: str) -> Optional[str]:
-        conn = self._get_connection()
-        cur = conn.execute("SELECT value FROM kvstore WHERE key=?", (key,))
-        row = cur.fetchone()
-        return row[0] if row else None
+        with self._cache.lock:
+            if key in self._cache.kv:
+                return self._cache.kv[key]
+        with self.connection() as conn:
+            row = conn.execute("SELECT value FROM kvstore WHERE key=?", (key,)).fetchone()
+        value = row[0] if row else None
+        with self._cache.lock:
+            return self._cache.kv.setdefault(key, value)
+
+    # Status delta log: small events appended between full status snapshots
+    def append_status_event(self, event: str):
+        self._enqueue_write("INSERT INTO status_events(event) VALUES(?)", (event,))
+
+    def fetch_status_events(self) -> List[str]:
+        with self.connection() as conn:
+            return [row[0] for row in conn.execute("SELECT event FROM status_events ORDER BY id")]
+
+    def clear_status_events(self):
+        self._enqueue_write("DELETE FROM status_events", ())
 
     # Catalog persistence helpers
     def upsert_tracks(self, tracks: Iterable[Dict]) -> None:
         """Upsert catalog track metadata while preserving download state."""
-        conn = self._get_connection()
-        epoch_seconds = int(time.time())
-        rows: List[Tuple] = []
-        for track in tracks:
-            identity = (track.get('identity') or '').strip()
-            artist = (track.get('artist') or 'Unknown').strip()
-            title = (track.get('title') or 'Unknown').strip()
-            if not identity:
-                continue
-            album = (track.get('album') or '').strip()
-            duration = int(track.get('duration') or 0)
-            playlist_id = track.get('playlist_id')
-            spotify_id = track.get('spotify_id')
-            expanded_from = track.get('expanded_from') or 'playlist'
-            rows.append((
+        # One clock read serves both last_seen and the catalog version token
+        now_ns = time.time_ns()
+        epoch_seconds = now_ns // 1_000_000_000
+        # Single comprehension: tracks without an identity are skipped before the rest is normalized
+        rows: List[Tuple] = [
+            (
                 identity,
-                artist,
-                title,
-                album,
-                duration,
-                playlist_id,
-                spotify_id,
-                expanded_from,
+                (track.get('artist') or 'Unknown').strip(),
+                (track.get('title') or 'Unknown').strip(),
+                (track.get('album') or '').strip(),
+                int(track.get('duration') or 0),
+                track.get('playlist_id'),
+                track.get('spotify_id'),
+                track.get('expanded_from') or 'playlist',
                 epoch_seconds,
-            ))
+            )
+            for track in tracks
+            if (identity := (track.get('identity') or '').strip())
+        ]
 
         if not rows:
             return
 
-        conn.executemany(
-            """
-            INSERT INTO tracks (identity, artist, title, album, duration, playlist_id, spotify_id, expanded_from, last_seen)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(identity) DO UPDATE SET
-                artist=excluded.artist,
-                title=excluded.title,
-                album=excluded.album,
-                duration=excluded.duration,
-                playlist_id=excluded.playlist_id,
-                spotify_id=excluded.spotify_id,
-                expanded_from=excluded.expanded_from,
-                last_seen=excluded.last_seen
-            """,
-            rows,
-        )
-        version_token = str(time.time_ns())
-        conn.execute(
-            "INSERT INTO kvstore(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-            ("catalog_version", version_token),
-        )
-        conn.commit()
+        with self.connection() as conn:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            bulk_load = (
+                len(rows) >= BULK_LOAD_MIN_ROWS
+                and conn.execute("SELECT 1 FROM tracks LIMIT 1").fetchone() is None
+            )
+            if bulk_load:
+                # The identity UNIQUE constraint stays: ON CONFLICT(identity) relies on it
+                for name, _ in TRACK_INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.executemany(
+                """
+                INSERT INTO tracks (identity, artist, title, album, duration, playlist_id, spotify_id, expanded_from, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(identity) DO UPDATE SET
+                    artist=excluded.artist,
+                    title=excluded.title,
+                    album=excluded.album,
+                    duration=excluded.duration,
+                    playlist_id=excluded.playlist_id,
+                    spotify_id=excluded.spotify_id,
+                    expanded_from=excluded.expanded_from,
+                    last_seen=excluded.last_seen
+                """,
+                rows,
+            )
+            if bulk_load:
+                for _, ddl in TRACK_INDEXES:
+                    conn.execute(ddl)
+            version_token = str(now_ns)
+            conn.execute(
+                "INSERT INTO kvstore(key,value) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                ("catalog_version", version_token),
+            )
+            conn.commit()
+        with self._cache.lock:
+            self._cache.kv["catalog_version"] = version_token
 
     def mark_download_success(self, identity: str, local_path: str):
-        conn = self._get_connection()
         now = int(time.time())
-        conn.execute(
+        self._enqueue_write(
             """
             UPDATE tracks
             SET status='downloaded', local_path=?, last_error=NULL, retry_after=NULL,
@@ -177,184 +501,233 @@ class DB:
             """,
             (local_path, now, identity),
         )
-        conn.commit()
 
     def mark_download_failure(self, identity: str, error: str):
-        conn = self._get_connection()
-        current = conn.execute(
-            "SELECT download_attempts FROM tracks WHERE identity=?",
-            (identity,),
-        ).fetchone()
-        attempts_val = (current[0] if current else 0) or 0
-        new_attempts = attempts_val + 1
-        base_delay = 300  # 5 minutes
-        delay = min(base_delay * (3 ** (new_attempts - 1)), 21600)  # cap at 6 hours
-        retry_after = int(time.time()) + delay
-        conn.execute(
+        now = int(time.time())
+        # Backoff is 5 minutes * 3^(attempts-1), capped at 6 hours; the CASE reads the
+        # pre-increment attempt count, so no separate SELECT is needed.
+        self._enqueue_write(
             """
             UPDATE tracks
-            SET status='missing', last_error=?, retry_after=?, download_attempts=?
+            SET status='missing', last_error=?,
+                retry_after=? + CASE COALESCE(download_attempts, 0)
+                    WHEN 0 THEN 300
+                    WHEN 1 THEN 900
+                    WHEN 2 THEN 2700
+                    WHEN 3 THEN 8100
+                    ELSE 21600
+                END,
+                download_attempts=COALESCE(download_attempts, 0) + 1
             WHERE identity=?
             """,
-            (error, retry_after, new_attempts, identity),
+            (error, now, identity),
         )
-        conn.commit()
 
     def reconcile_catalog_paths(self) -> Dict[str, int]:
         """Ensure catalog status matches filesystem presence."""
-        conn = self._get_connection()
-        rows = conn.execute(
-            "SELECT identity, local_path, status FROM tracks"
-        ).fetchall()
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT identity, local_path, status FROM tracks"
+            ).fetchall()
         now = int(time.time())
-        updated_downloaded = 0
-        updated_missing = 0
 
+        to_downloaded: List[Tuple] = []
+        to_missing: List[Tuple] = []
         for identity, local_path, status in rows:
             path_exists = bool(local_path and os.path.isfile(local_path))
             if path_exists and status != 'downloaded':
-                conn.execute(
-                    "UPDATE tracks SET status='downloaded', last_error=NULL, retry_after=NULL, last_seen=? WHERE identity=?",
-                    (now, identity),
-                )
-                updated_downloaded += 1
+                to_downloaded.append((now, identity, local_path))
             elif not path_exists and status != 'missing':
-                conn.execute(
-                    "UPDATE tracks SET status='missing' WHERE identity=?",
-                    (identity,),
+                to_missing.append((identity, local_path))
+
+        if to_downloaded or to_missing:
+            with self.connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Rows are matched on the local_path that was checked, so a download
+                # recorded since the SELECT is never overwritten with a stale status
+                conn.executemany(
+                    "UPDATE tracks SET status='downloaded', last_error=NULL, retry_after=NULL, last_seen=? "
+                    "WHERE identity=? AND local_path IS ?",
+                    to_downloaded,
                 )
-                updated_missing += 1
-        conn.commit()
+                conn.executemany(
+                    "UPDATE tracks SET status='missing' WHERE identity=? AND local_path IS ?",
+                    to_missing,
+                )
+                conn.commit()
         return {
-            'downloaded': updated_downloaded,
-            'missing': updated_missing,
+            'downloaded': len(to_downloaded),
+            'missing': len(to_missing),
         }
 
     def select_tracks_for_queue(self, limit: Optional[int] = None) -> List[Dict]:
-        conn = self._get_connection()
-        now = int(time.time())
-        sql = (
-            "SELECT identity, artist, title, album, duration "
-            "FROM tracks "
-            "WHERE status='missing' AND (retry_after IS NULL OR retry_after <= ?) "
-            "ORDER BY last_seen ASC"
-        )
-        params = [now]
-        if limit:
-            sql += " LIMIT ?"
-            params.append(limit)
-        cur = conn.execute(sql, params)
-        rows = cur.fetchall()
-        return [
-            {
-                'identity': row[0],
-                'artist': row[1],
-                'title': row[2],
-                'album': row[3],
-                'duration': row[4],
-            }
-            for row in rows
-        ]
+        with self.connection() as conn:
+            now = int(time.time())
+            sql = (
+                "SELECT identity, artist, title, album, duration "
+                "FROM tracks "
+                "WHERE status='missing' AND (retry_after IS NULL OR retry_after <= ?) "
+                "ORDER BY last_seen ASC"
+            )
+            params = [now]
+            if limit:
+                sql += " LIMIT ?"
+                params.append(limit)
+            cur = conn.execute(sql, params)
+            rows = cur.fetchall()
+            return [
+                {
+                    'identity': row[0],
+                    'artist': row[1],
+                    'title': row[2],
+                    'album': row[3],
+                    'duration': row[4],
+                }
+                for row in rows
+            ]
 
     def fetch_catalog_tracks(self) -> List[Dict]:
-        conn = self._get_connection()
-        cur = conn.execute(
-            """
-            SELECT identity, artist, title, album, duration, status, spotify_id, playlist_id, local_path
-            FROM tracks
-            ORDER BY artist COLLATE NOCASE, title COLLATE NOCASE
-            """
-        )
-        rows = cur.fetchall()
-        result: List[Dict] = []
-        for identity, artist, title, album, duration, status, spotify_id, playlist_id, local_path in rows:
-            result.append({
-                'id': identity,
-                'name': title,
-                'artist': artist,
-                'album': album,
-                'duration': duration,
-                'status': status or 'pending',
-                'spotify_id': spotify_id,
-                'playlist_id': playlist_id,
-                'local_path': local_path,
-            })
-        return result
+        with self.connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT identity, artist, title, album, duration, status, spotify_id, playlist_id, local_path
+                FROM tracks
+                ORDER BY artist COLLATE NOCASE, title COLLATE NOCASE
+                """
+            )
+            # Build dicts straight off the cursor; fetchall() would materialize every row first
+            return [
+                {
+                    'id': identity,
+                    'name': title,
+                    'artist': artist,
+                    'album': album,
+                    'duration': duration,
+                    'status': status or 'pending',
+                    'spotify_id': spotify_id,
+                    'playlist_id': playlist_id,
+                    'local_path': local_path,
+                }
+                for identity, artist, title, album, duration, status, spotify_id, playlist_id, local_path in cur
+            ]
 
     def fetch_catalog_artists(self) -> List[Dict]:
-        conn = self._get_connection()
-        cur = conn.execute(
-            """
-            SELECT artist, COUNT(*) as song_count
-            FROM tracks
-            GROUP BY artist
-            ORDER BY artist COLLATE NOCASE
-            """
-        )
-        rows = cur.fetchall()
-        return [
-            {'id': f"artist_{abs(hash(row[0])) % 100000}", 'name': row[0], 'song_count': row[1]}
-            for row in rows if row[0]
-        ]
+        with self.connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT artist, COUNT(*) as song_count
+                FROM tracks
+                GROUP BY artist
+                ORDER BY artist COLLATE NOCASE
+                """
+            )
+            return [
+                {'id': _stable_id('artist', artist), 'name': artist, 'song_count': song_count}
+                for artist, song_count in cur if artist
+            ]
 
     def fetch_catalog_albums(self) -> List[Dict]:
-        conn = self._get_connection()
-        cur = conn.execute(
-            """
-            SELECT album, artist, COUNT(*) as track_count
-            FROM tracks
-            WHERE album IS NOT NULL AND album != ''
-            GROUP BY album, artist
-            ORDER BY album COLLATE NOCASE
-            """
-        )
-        rows = cur.fetchall()
-        return [
-            {'id': f"album_{abs(hash((row[0], row[1]))) % 100000}", 'name': row[0], 'artist': row[1], 'track_count': row[2]}
-            for row in rows
-        ]
+        with self.connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT album, artist, COUNT(*) as track_count
+                FROM tracks
+                WHERE album IS NOT NULL AND album != ''
+                GROUP BY album, artist
+                ORDER BY album COLLATE NOCASE
+                """
+            )
+            return [
+                {'id': _stable_id('album', f"{album}\x1f{artist}"), 'name': album, 'artist': artist, 'track_count': track_count}
+                for album, artist, track_count in cur
+            ]
 
     def get_catalog_version(self) -> Optional[str]:
         return self.get_kv('catalog_version')
 
     def get_catalog_counts(self) -> Dict[str, int]:
-        conn = self._get_connection()
-        songs = conn.execute("SELECT COUNT(*) FROM tracks").fetchone()[0] or 0
-        artists = conn.execute("SELECT COUNT(DISTINCT artist) FROM tracks WHERE artist IS NOT NULL AND artist != ''").fetchone()[0] or 0
-        albums = conn.execute("SELECT COUNT(DISTINCT album) FROM tracks WHERE album IS NOT NULL AND album != ''").fetchone()[0] or 0
-        downloaded = conn.execute("SELECT COUNT(*) FROM tracks WHERE status='downloaded'").fetchone()[0] or 0
-        missing = conn.execute("SELECT COUNT(*) FROM tracks WHERE status='missing'").fetchone()[0] or 0
-        return {
-            'songs': songs,
-            'artists': artists,
-            'albums': albums,
-            'downloaded': downloaded,
-            'missing': missing,
-        }
+        with self.connection() as conn:
+            # One pass over tracks instead of five separate COUNT scans
+            songs, artists, albums, downloaded, missing = conn.execute(
+                """
+                SELECT COUNT(*),
+                       COUNT(DISTINCT CASE WHEN artist <> '' THEN artist END),
+                       COUNT(DISTINCT CASE WHEN album <> '' THEN album END),
+                       SUM(status='downloaded'),
+                       SUM(status='missing')
+                FROM tracks
+                """
+            ).fetchone()
+            return {
+                'songs': songs or 0,
+                'artists': artists or 0,
+                'albums': albums or 0,
+                'downloaded': downloaded or 0,
+                'missing': missing or 0,
+            }
+
+
+# Keyring lookups go through the OS credential backend (DBus/Keychain), which is slow;
+# loaded tokens are cached per database file. save()/clear() update the cache only after
+# their write and bump a generation, so a load() that read the old values concurrently
+# cannot put them back.
+TOKEN_CACHE_TTL = 30.0
+_token_cache: Dict[str, Tuple[float, Tuple[Optional[str], Optional[str]]]] = {}
+_token_generation: Dict[str, int] = {}
+_token_cache_lock = threading.Lock()
 
 
 class TokenStore:
     def __init__(self, db: DB):
         self.db = db
+        self._cache_key = os.path.abspath(str(db.path))
+
+    def _replace_cached(self, tokens=None):
+        """Cache tokens just written (or drop the entry) and fence off in-flight loads."""
+        with _token_cache_lock:
+            _token_generation[self._cache_key] = _token_generation.get(self._cache_key, 0) + 1
+            if tokens is None:
+                _token_cache.pop(self._cache_key, None)
+            else:
+                _token_cache[self._cache_key] = (time.monotonic(), tokens)
 
     def save(self, access_token: str, refresh_token: str):
         # Prefer OS keyring if available; fall back to DB settings
-        try:
-            import keyring  # type: ignore
-            keyring.set_password('youspotter', 'spotify_access_token', access_token)
-            keyring.set_password('youspotter', 'spotify_refresh_token', refresh_token)
-        except Exception:
+        stored = False
+        if keyring is not None:
+            try:
+                keyring.set_password('youspotter', 'spotify_access_token', access_token)
+                keyring.set_password('youspotter', 'spotify_refresh_token', refresh_token)
+                stored = True
+            except Exception:
+                pass
+        if not stored:
             # Do not log tokens
             self.db.set_setting("spotify_access_token", access_token)
             self.db.set_setting("spotify_refresh_token", refresh_token)
+            self.db.flush()
+        self._replace_cached((access_token, refresh_token))
 
     def load(self):
+        with _token_cache_lock:
+            cached = _token_cache.get(self._cache_key)
+            generation = _token_generation.get(self._cache_key, 0)
+        if cached and time.monotonic() - cached[0] < TOKEN_CACHE_TTL:
+            return cached[1]
+        tokens = self._load_uncached()
+        with _token_cache_lock:
+            # A save()/clear() during the read makes these values stale; do not cache them
+            if _token_generation.get(self._cache_key, 0) == generation:
+                _token_cache[self._cache_key] = (time.monotonic(), tokens)
+        return tokens
+
+    def _load_uncached(self):
         try:
-            import keyring  # type: ignore
-            at = keyring.get_password('youspotter', 'spotify_access_token')
-            rt = keyring.get_password('youspotter', 'spotify_refresh_token')
-            if at or rt:
-                return at, rt
+            if keyring is not None:
+                at = keyring.get_password('youspotter', 'spotify_access_token')
+                rt = keyring.get_password('youspotter', 'spotify_refresh_token')
+                if at or rt:
+                    return at, rt
         except Exception:
             pass
         return (
@@ -365,10 +738,12 @@ class TokenStore:
     def clear(self):
         # Clear tokens from both keyring and DB
         try:
-            import keyring  # type: ignore
-            keyring.delete_password('youspotter', 'spotify_access_token')
-            keyring.delete_password('youspotter', 'spotify_refresh_token')
+            if keyring is not None:
+                keyring.delete_password('youspotter', 'spotify_access_token')
+                keyring.delete_password('youspotter', 'spotify_refresh_token')
         except Exception:
             pass
         self.db.set_setting("spotify_access_token", "")
         self.db.set_setting("spotify_refresh_token", "")
+        self.db.flush()
+        self._replace_cached()
@@ -2,47 +2,55 @@ import threading
 import time
 from contextlib import contextmanager
 
+# Holding _lock is the only "sync running" flag. A sync that overruns _SYNC_TIMEOUT
+# is abandoned by swapping in a fresh lock; the stuck owner still releases the old
+# lock itself when it finishes, so no thread ever releases a lock it does not hold.
 _lock = threading.Lock()
-_busy = False
 _busy_since = None
+_swap_lock = threading.Lock()
 _SYNC_TIMEOUT = 1800  # 30 minutes max sync time
 
+
+def _recover_if_timed_out(lock: threading.Lock) -> bool:
+    """Replace a lock held past the timeout; returns True if it was replaced."""
+    global _lock, _busy_since
+    with _swap_lock:
+        since = _busy_since
+        if _lock is not lock or since is None or time.monotonic() - since <= _SYNC_TIMEOUT:
+            return False
+        print(f"WARNING: Sync lock timed out after {_SYNC_TIMEOUT}s, auto-recovering")
+        _lock = threading.Lock()
+        _busy_since = None
+        return True
+
+
 @contextmanager
 def sync_lock():
-    global _busy, _busy_since
-    acquired = _lock.acquire(blocking=False)
+    global _busy_since
+    lock = _lock
+    acquired = lock.acquire(blocking=False)
+    if not acquired and _recover_if_timed_out(lock):
+        lock = _lock
+        acquired = lock.acquire(blocking=False)
+    if not acquired:
+        # Already running
+        yield False
+        return
+    _busy_since = time.monotonic()
     try:
-        if not acquired or _busy:
-            # Already running
-            yield False
-            return
-        _busy = True
-        _busy_since = time.time()
         yield True
     finally:
-        if acquired and _busy:
-            _busy = False
-            _busy_since = None
-            _lock.release()
+        with _swap_lock:
+            if _lock is lock:
+                _busy_since = None
+        lock.release()
 
-def is_sync_running() -> bool:
-    """Check if a sync is currently running without acquiring the lock. Auto-recovers from timeouts."""
-    global _busy, _busy_since
 
-    if not _busy:
-        return False
-
-    # Check for timeout - auto-recover stuck locks
-    if _busy_since and time.time() - _busy_since > _SYNC_TIMEOUT:
-        print(f"WARNING: Sync lock timed out after {_SYNC_TIMEOUT}s, auto-recovering")
-        _busy = False
-        _busy_since = None
-        try:
-            _lock.release()
-        except RuntimeError:
-            # Lock wasn't held, that's fine
-            pass
+def is_sync_running() -> bool:
+    """Check if a sync is currently running without holding the lock. Auto-recovers from timeouts."""
+    lock = _lock
+    # locked() only inspects the lock; probing with acquire/release could make a
+    # concurrent sync_lock() see it held and skip its sync
+    if not lock.locked():
         return False
-
-    return _busy
-
+    return not _recover_if_timed_out(lock)
@@ -1,17 +1,46 @@
+import concurrent.futures
+import hashlib
+import logging
 import os
 import threading
 import time
-from datetime import datetime, timezone
-from typing import List, Dict, Callable, Optional
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import List, Dict, Callable, Optional, Tuple
 from youspotter.sync_lock import sync_lock
-from youspotter.status import set_status, get_status, set_totals, set_queue, queue_move_to_current, queue_complete, add_recent
+from youspotter.status import (
+    set_status, get_status, set_totals, set_queue, set_counts_and_queue, queue_move_to_current,
+    queue_complete, queue_item, add_recent, queue_update_progress, now_iso,
+)
 from youspotter.queue import DedupQueue, identity_key
-from youspotter.utils.matching import song_match, song_match_fuzzy
+from youspotter.utils.matching import song_match, song_match_fuzzy_prepared, song_match_prepare
 from youspotter.downloader import attempt_with_retries
 from youspotter.storage import DB
 from youspotter.config import load_config
 
 
+# Per-download progress chatter goes here at DEBUG so it stays off the hot path
+log = logging.getLogger('youspotter.sync')
+
+# How many directory levels below the music root the polling monitor inspects
+POLL_SCAN_DEPTH = 4
+# Threads scanning top-level directories concurrently (I/O bound, so above core count)
+POLL_SCAN_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Playlist strategy expansion: at most this many artists (and albums) per sync,
+# fetched with this many concurrent Spotify requests
+EXPANSION_CAP = 100
+EXPANSION_WORKERS = 8
+
+# Completed items kept in the live queue; older entries fall off the end
+LIVE_COMPLETED_LIMIT = 500
+
+
+def _live_identity(item: Dict) -> str:
+    """Identity used to index live queue items; catalog rows already carry it."""
+    return item.get('identity') or identity_key(item)
+
+
 class SyncService:
     def __init__(
         self,
@@ -33,17 +62,41 @@ class SyncService:
         self._enable_watchdog = enable_watchdog
         self._stop = threading.Event()
         self._paused = threading.Event()
+        # Mirror of "not paused": a paused worker blocks on this instead of polling _paused
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         self._timer_reset = threading.Event()  # Signal for scheduler timer reset
         self._thread: Optional[threading.Thread] = None
         self._download_thread: Optional[threading.Thread] = None
         self._current_download_future = None  # Track current download for cancellation
+        # Reused across downloads (created lazily, shut down with the worker) so each
+        # track does not spawn and join its own thread
+        self._download_executor = None
+        self._executor_lock = threading.Lock()
+        # The next pending item's YouTube search runs on its own thread while the
+        # current download is in flight: (identity, future), used by the worker only
+        self._search_executor = None
+        self._prefetched_search = None
 
         # Lightweight status tracking (deadlock-free) - now master
-        self._status_lock = threading.Lock()
+        # One lock per section so progress ticks on "current" do not contend with
+        # reconcile replacing "pending". Lock order when nesting: pending, current, completed.
+        self._pending_lock = threading.Lock()
+        self._current_lock = threading.Lock()
+        self._completed_lock = threading.Lock()
+        # Immutable (current, pending, completed) tuples republished by writers after
+        # each change, so get_live_queue_status() reads one attribute without locking.
+        # Progress updates mutate the shared item dicts and need no republish.
+        self._live_snapshot: tuple[tuple, tuple, tuple] = ((), (), ())
+        self._publish_lock = threading.Lock()
+        # current/pending are keyed by _live_identity() so moves and progress
+        # updates are dict operations instead of scans over the whole queue;
+        # completed is a bounded deque so recording a completion does not shift the
+        # history and a long-running service does not accumulate it forever
         self._live_status = {
-            "current": [],  # Currently downloading items
-            "pending": [],  # Pending queue items
-            "completed": []  # Completed items with status
+            "current": {},  # Currently downloading items, in start order
+            "pending": OrderedDict(),  # Pending queue items, in queue order
+            "completed": deque(maxlen=LIVE_COMPLETED_LIMIT)  # Completed items with status, newest first
         }
 
         # Load persistent queue into live queue on startup
@@ -59,10 +112,28 @@ class SyncService:
         self._fs_watch_stop = threading.Event()
         self._fs_poll_thread: Optional[threading.Thread] = None
         self._pending_reconcile = threading.Event()
+        # Filesystem-triggered reconciles run on one reused worker thread
+        self._reconcile_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='ys-reconcile'
+        )
         self._last_reconcile = 0.0
         self._reconcile_interval = 10.0
-
-        # Track sync progress for UI/telemetry
+        # Completed downloads only force a full reconcile every few items or once the
+        # queue drains; the downloaded/missing counters are still refreshed after each one
+        self._downloads_since_reconcile = 0
+        self._reconcile_batch_size = 20
+        # The worker sleeps on _queue_event, which is set whenever pending is replaced
+        # (and on stop), instead of ticking every second. The timeout is only a fallback.
+        # While the queue is empty it only re-checks the catalog (e.g. for expired
+        # retry_after backoffs) every _idle_reconcile_interval; syncs and filesystem
+        # events still reconcile immediately
+        self._queue_event = threading.Event()
+        self._queue_wait_timeout = 30.0
+        self._queue_idle = False
+        self._idle_reconcile_interval = 60.0
+
+        # Track sync progress for UI/telemetry. Writers serialize on _progress_lock and
+        # swap in a fresh dict; readers take the current reference without locking.
         self._progress_lock = threading.Lock()
         self._progress = {
             "phase": "idle",
@@ -75,6 +146,29 @@ class SyncService:
         self._last_progress_processed = 0
         self._progress['heartbeat'] = time.time()
 
+    def _expand_tracks(self, jobs: List[Tuple[Callable[[str], List[Dict]], str, str]]) -> List[Dict]:
+        """Run (fetch, id, source) lookups concurrently, tagging tracks with expanded_from=source.
+
+        Progress is reported as each lookup finishes; results keep the order of jobs.
+        """
+        results: List[List[Dict]] = [[] for _ in jobs]
+        total = len(jobs)
+        self._set_progress("expand", 0, total)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=EXPANSION_WORKERS) as pool:
+            futures = {pool.submit(fetch, item_id): idx for idx, (fetch, item_id, _source) in enumerate(jobs)}
+            for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                idx = futures[future]
+                try:
+                    batch = future.result() or []
+                except Exception:
+                    batch = []
+                source = jobs[idx][2]
+                for track in batch:
+                    track['expanded_from'] = source
+                results[idx] = batch
+                self._set_progress("expand", done, total)
+        return [track for batch in results for track in batch]
+
     def sync_spotify_tracks(self) -> bool:
         """Sync Spotify track data and update pending queue"""
         self._set_progress("initialize", 0, 0)
@@ -85,52 +179,53 @@ class SyncService:
         try:
             strategies = self.fetch_playlist_strategies() or {}
             if strategies and self.spotify_client:
-                # derive artists/albums from base tracks by playlist
-                artist_ids = set()
-                album_ids = set()
-                for t in tracks:
-                    pid = t.get('playlist_id')
-                    st = strategies.get(str(pid), {})
+                # Normalize each playlist's strategy once: (artist_flag, album_flag)
+                playlist_rules: Dict[str, tuple[bool, bool]] = {}
+                for pid, st in strategies.items():
                     # Support old string strategies for backward-compat
                     if isinstance(st, str):
-                        song = (st == 'song-only') or (st == 'all')
                         artist_flag = (st in ('all-artist-songs','all'))
                         album_flag = (st in ('all-album-songs','all'))
-                    else:
-                        song = bool(st.get('song'))
+                    elif isinstance(st, dict):
                         artist_flag = bool(st.get('artist'))
                         album_flag = bool(st.get('album'))
+                    else:
+                        continue
+                    if artist_flag or album_flag:
+                        playlist_rules[str(pid)] = (artist_flag, album_flag)
+                # derive artists/albums from base tracks by playlist
+                artist_ids = set()
+                album_ids = set()
+                for t in tracks:
+                    rules = playlist_rules.get(str(t.get('playlist_id')))
+                    if rules is None:
+                        continue
+                    artist_flag, album_flag = rules
                     if artist_flag and t.get('artist_id'):
                         artist_ids.add(t.get('artist_id'))
                     if album_flag and t.get('album_id'):
                         album_ids.add(t.get('album_id'))
-                expanded: List[Dict] = list(tracks)
-                for aid in list(artist_ids)[:100]:  # cap to avoid explosion
-                    try:
-                        artist_tracks = self.spotify_client.get_artist_songs(aid) or []
-                        for artist_track in artist_tracks:
-                            artist_track['expanded_from'] = 'artist'
-                            expanded.append(artist_track)
-                    except Exception:
-                        pass
-                for aid in list(album_ids)[:100]:  # cap to avoid explosion
-                    try:
-                        album_tracks = self.spotify_client.get_album_songs(aid) or []
-                        for album_track in album_tracks:
-                            album_track['expanded_from'] = 'album'
-                            expanded.append(album_track)
-                    except Exception:
-                        pass
-                tracks = expanded
+                # Each lookup is an independent Spotify round-trip, so fan them out. Sorting
+                # makes the capped subset stable across syncs (and the client's cache useful).
+                client = self.spotify_client
+                jobs = [(client.artist_all_tracks, aid, 'artist') for aid in islice(sorted(artist_ids), EXPANSION_CAP)]
+                jobs += [(client.album_tracks, alid, 'album') for alid in islice(sorted(album_ids), EXPANSION_CAP)]
+                if jobs:
+                    # tracks is already a private copy; duplicates are dropped by identity
+                    # in the single dedup pass below, before anything is persisted or queued
+                    tracks.extend(self._expand_tracks(jobs))
         except Exception:
             pass
 
         total_candidates = len(tracks)
         self._set_progress("expand", total_candidates, total_candidates)
 
-        # Deduplicate tracks using identity key to avoid duplicate queue entries
-        deduped_tracks: List[Dict] = []
-        seen_identities = set()
+        # Single pass: deduplicate by identity key (avoiding duplicate queue entries),
+        # collect the artist/album totals and build the catalog rows together. The
+        # dict keeps first-seen order, so it doubles as the ordered dedup set.
+        catalog: Dict[str, Dict] = {}
+        artist_names = set()
+        album_names = set()
         if total_candidates:
             self._set_progress("dedupe", 0, total_candidates)
         for idx, track in enumerate(tracks):
@@ -140,48 +235,38 @@ class SyncService:
                 ident = None
             if not ident:
                 continue
-            if ident in seen_identities:
+            if ident in catalog:
                 continue
-            seen_identities.add(ident)
-            deduped_tracks.append(dict(track))
+            artist_names.add(track.get('artist', ''))
+            album = track.get('album') or ''
+            if album:
+                album_names.add(album)
+            catalog[ident] = {
+                'identity': ident,
+                'artist': track.get('artist', '').strip() or 'Unknown',
+                'title': track.get('title', '').strip() or 'Unknown',
+                'album': album,
+                'duration': int(track.get('duration') or 0),
+                'playlist_id': track.get('playlist_id'),
+                'spotify_id': track.get('id') or track.get('spotify_id'),
+                'expanded_from': track.get('expanded_from', 'playlist'),
+            }
             if total_candidates and ((idx + 1) % 50 == 0 or (idx + 1) == total_candidates):
                 self._set_progress("dedupe", idx + 1, total_candidates)
 
-        tracks = deduped_tracks
-        self._set_progress("dedupe", len(tracks), len(tracks))
+        catalog_items = list(catalog.values())
+        songs = len(catalog_items)
+        artists = len(artist_names)
+        albums = len(album_names)
+        self._set_progress("dedupe", songs, songs)
 
-        # Compute totals for tracking using deduplicated list
-        songs = artists = albums = 0
         try:
-            songs = len(tracks)
-            artists = len({t.get('artist','') for t in tracks})
-            albums = len({t.get('album','') for t in tracks if t.get('album')})
-            from youspotter.status import set_totals
             set_totals(songs, artists, albums)
         except Exception:
             pass
 
-        from youspotter.status import add_recent
-
-        catalog_items: List[Dict] = []
-        if tracks:
-            self._set_progress("persist", 0, len(tracks))
-        for track in tracks:
-            artist = track.get('artist', '').strip() or 'Unknown'
-            title = track.get('title', '').strip() or 'Unknown'
-            album = track.get('album') or ''
-            duration = int(track.get('duration') or 0)
-            ident = identity_key(track)
-            catalog_items.append({
-                'identity': ident,
-                'artist': artist,
-                'title': title,
-                'album': album,
-                'duration': duration,
-                'playlist_id': track.get('playlist_id'),
-                'spotify_id': track.get('id') or track.get('spotify_id'),
-                'expanded_from': track.get('expanded_from', 'playlist'),
-            })
+        if catalog_items:
+            self._set_progress("persist", 0, songs)
 
         if self.db:
             try:
@@ -189,9 +274,9 @@ class SyncService:
                 if catalog_items:
                     self._set_progress("persist", len(catalog_items), len(catalog_items))
             except Exception as db_err:
-                print(f"Warning: failed to upsert catalog: {db_err}")
+                log.warning("Failed to upsert catalog: %s", db_err)
 
-        total_for_reconcile = max(len(tracks), 1)
+        total_for_reconcile = max(songs, 1)
         self._set_progress("reconcile", 0, total_for_reconcile)
         reconciliation = self.reconcile_catalog(force=True)
         if reconciliation:
@@ -203,7 +288,7 @@ class SyncService:
         self._set_progress("reconcile", pending_count, display_total)
 
         add_recent(
-            f"Synced {len(tracks)} tracks from Spotify ({songs} songs, {artists} artists, {albums} albums) — pending: {pending_count}",
+            f"Synced {songs} tracks from Spotify ({songs} songs, {artists} artists, {albums} albums) — pending: {pending_count}",
             "SUCCESS",
         )
 
@@ -221,28 +306,16 @@ class SyncService:
             self.db.reconcile_catalog_paths()
             counts = self.db.get_catalog_counts()
 
-            from youspotter.status import set_totals, set_status, set_queue
-
-            set_totals(counts['songs'], counts['artists'], counts['albums'])
-            set_status({
-                'missing': counts['missing'],
-                'downloaded': counts['downloaded'],
-            })
-
-            pending_records = self.db.select_tracks_for_queue()
-            pending_queue = [
-                {
-                    'artist': item['artist'],
-                    'title': item['title'],
-                    'album': item['album'],
-                    'duration': item['duration'],
-                    'identity': item['identity'],
-                }
-                for item in pending_records
-            ]
+            # Rows already have exactly the live queue's fields; use them as-is rather
+            # than rebuilding an identical dict per track
+            pending_queue = self.db.select_tracks_for_queue()
 
             self.set_live_pending_queue(pending_queue)
-            set_queue([{k: v for k, v in item.items() if k != 'identity'} for item in pending_queue])
+            # One status update (and one persisted snapshot) per reconcile
+            set_counts_and_queue(
+                {key: counts[key] for key in ('songs', 'artists', 'albums', 'missing', 'downloaded')},
+                pending_queue,
+            )
 
             self._last_reconcile = now
 
@@ -250,7 +323,7 @@ class SyncService:
                 try:
                     threading.Thread(target=self.catalog_refresh_callback, daemon=True).start()
                 except Exception as refresh_err:
-                    print(f"Warning: failed to refresh catalog cache: {refresh_err}")
+                    log.warning("Failed to refresh catalog cache: %s", refresh_err)
 
             self._ensure_watchdog()
 
@@ -259,7 +332,7 @@ class SyncService:
                 'counts': counts,
             }
         except Exception as exc:
-            print(f"Warning: catalog reconciliation failed: {exc}")
+            log.warning("Catalog reconciliation failed: %s", exc)
             return None
 
     def _ensure_watchdog(self):
@@ -288,7 +361,7 @@ class SyncService:
             from watchdog.observers import Observer
             from watchdog.events import FileSystemEventHandler
         except ImportError:
-            print("Watchdog not available; falling back to polling monitor")
+            log.info("Watchdog not available; falling back to polling monitor")
             self._start_polling_monitor(path)
             return
 
@@ -306,7 +379,7 @@ class SyncService:
             observer.start()
             self._fs_observer = observer
         except Exception as e:
-            print(f"Warning: unable to start filesystem observer: {e}")
+            log.warning("Unable to start filesystem observer: %s", e)
             self._start_polling_monitor(path)
 
     def _start_polling_monitor(self, path: str):
@@ -315,22 +388,54 @@ class SyncService:
 
         stop_event = self._fs_watch_stop
 
-        def snapshot() -> tuple[int, int]:
+        def subtree_digest(root: str, depth: int) -> bytes:
+            # Adding or removing a file bumps its parent directory's mtime, so hashing the
+            # directory mtimes (library layout is artist/album/file) catches changes below
+            # the root without stat()ing every file
+            digest = hashlib.blake2b(digest_size=16)
+            stack = [(root, depth)]
+            while stack:
+                current, level = stack.pop()
+                try:
+                    digest.update(f"{current}\0{os.stat(current).st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+                    if level >= POLL_SCAN_DEPTH:
+                        continue
+                    with os.scandir(current) as entries:
+                        subdirs = sorted(e.path for e in entries if e.is_dir(follow_symlinks=False))
+                except OSError:
+                    continue
+                stack.extend((sub, level + 1) for sub in subdirs)
+            return digest.digest()
+
+        # Top-level (artist) directories are scanned concurrently: on network mounts each
+        # readdir/stat is a round-trip, and the subtrees are independent
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=POLL_SCAN_WORKERS, thread_name_prefix='ys-poll')
+
+        def snapshot() -> bytes:
+            digest = hashlib.blake2b(digest_size=16)
             try:
-                stat = os.stat(path)
-                return int(stat.st_mtime), int(stat.st_size)
-            except FileNotFoundError:
-                return 0, 0
+                digest.update(str(os.stat(path).st_mtime_ns).encode('ascii'))
+                with os.scandir(path) as entries:
+                    top = sorted(e.path for e in entries if e.is_dir(follow_symlinks=False))
+            except OSError:
+                return digest.digest()
+            # map() yields in submission order, so the combined digest is deterministic
+            for part in pool.map(lambda d: subtree_digest(d, 1), top):
+                digest.update(part)
+            return digest.digest()
 
         last_snapshot = snapshot()
 
         def poll_loop():
             nonlocal last_snapshot
-            while not stop_event.wait(30):
-                current = snapshot()
-                if current != last_snapshot:
-                    self._schedule_reconcile()
-                last_snapshot = current
+            try:
+                while not stop_event.wait(30):
+                    current = snapshot()
+                    if current != last_snapshot:
+                        self._schedule_reconcile()
+                    last_snapshot = current
+            finally:
+                pool.shutdown(wait=False)
 
         thread = threading.Thread(target=poll_loop, daemon=True)
         thread.start()
@@ -356,15 +461,15 @@ class SyncService:
         if self._pending_reconcile.is_set():
             return
         self._pending_reconcile.set()
+        self._reconcile_executor.submit(self._debounced_reconcile)
 
-        def run():
-            try:
-                time.sleep(1)
-                self.reconcile_catalog(force=True)
-            finally:
-                self._pending_reconcile.clear()
-
-        threading.Thread(target=run, daemon=True).start()
+    def _debounced_reconcile(self):
+        try:
+            # Let a burst of filesystem events settle before reconciling once
+            time.sleep(1)
+            self.reconcile_catalog(force=True)
+        finally:
+            self._pending_reconcile.clear()
 
     def _set_progress(self, phase: str, processed: int | None = None, total: int | None = None):
         """Update progress snapshot and emit throttled logging."""
@@ -377,11 +482,11 @@ class SyncService:
                 snapshot['processed'] = max(0, int(processed))
             if total is not None:
                 snapshot['total'] = max(0, int(total))
-            self._progress.update(snapshot)
+            self._progress = snapshot
 
-            current_phase = self._progress['phase']
-            current_processed = self._progress.get('processed', 0)
-            current_total = self._progress.get('total', 0)
+            current_phase = snapshot['phase']
+            current_processed = snapshot.get('processed', 0)
+            current_total = snapshot.get('total', 0)
 
             should_log = False
             phase_changed = current_phase != self._last_progress_phase
@@ -403,15 +508,14 @@ class SyncService:
             message = (
                 f"Sync progress — phase={friendly_phase} processed={current_processed}/{current_total}"
             )
-            print(message)
+            log.info(message)
             try:
                 add_recent(message, "INFO")
             except Exception:
                 pass
 
     def get_sync_progress(self) -> dict:
-        with self._progress_lock:
-            snapshot = dict(self._progress)
+        snapshot = self._progress
         heartbeat_epoch = int(snapshot.get('heartbeat', 0))
         return {
             "phase": snapshot.get('phase', 'idle'),
@@ -426,7 +530,6 @@ class SyncService:
             if not acquired:
                 return False
             try:
-                from youspotter.status import add_recent
                 add_recent(f"Sync starting ({reason})", "INFO")
             except Exception:
                 pass
@@ -437,71 +540,71 @@ class SyncService:
 
     def _download_worker_loop(self):
         """Continuously process download queue"""
-        print("Download worker loop starting...")
+        log.info("Download worker loop starting")
         heartbeat_counter = 0
         while not self._stop.is_set():
             try:
                 # Check if paused and wait for resume
                 if self._paused.is_set():
-                    print("Download worker: Paused, waiting for resume...")
-                    # Wait until paused is cleared
-                    while self._paused.is_set() and not self._stop.is_set():
-                        time.sleep(0.1)  # Small sleep to avoid busy waiting
+                    log.debug("Download worker: Paused, waiting for resume")
+                    # Block until resumed; the timeout only bounds how late a stop is noticed
+                    while not self._resume_event.wait(timeout=1.0):
+                        if self._stop.is_set():
+                            break
                     if self._stop.is_set():
                         break
-                    print("Download worker: Resumed")
+                    log.debug("Download worker: Resumed")
                     continue
 
-                # Heartbeat logging every 5 iterations (5 seconds)
+                # Heartbeat logging every 5 iterations, at DEBUG so idle ticks cost nothing
                 heartbeat_counter += 1
-                if heartbeat_counter % 5 == 0:
-                    status = get_status()
-                    pending_count = len(status.get('queue', {}).get('pending', []))
-                    current_count = len(status.get('queue', {}).get('current', []))
-                    print(f"Download worker heartbeat: {pending_count} pending, {current_count} current")
+                if heartbeat_counter % 5 == 0 and log.isEnabledFor(logging.DEBUG):
+                    # The live snapshot is authoritative and lock-free; get_status() would
+                    # copy the persisted state under the status lock just to count it
+                    current, pending, _completed = self._live_snapshot
+                    log.debug("Download worker heartbeat: %d pending, %d current", len(pending), len(current))
 
                 self._process_download_queue()
             except Exception as e:
-                print(f"Download worker error: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Download worker error: %s", e)
                 add_recent(f"Download worker exception: {str(e)}", "ERROR")
-            self._stop.wait(1)  # Check for new items every 1 second
-        print("Download worker loop stopped.")
+            # Sleep until the pending queue changes (or the fallback timeout passes)
+            self._queue_event.wait(timeout=self._queue_wait_timeout)
+            self._queue_event.clear()
+        log.info("Download worker loop stopped")
 
     def _process_download_queue(self):
         """Process downloads sequentially for concurrency=1"""
-        from youspotter.status import add_recent
-        from youspotter.queue import identity_key
 
         try:
-            print("Download worker: Starting queue processing")
-            reconciliation = self.reconcile_catalog()
-            live_status = self.get_live_queue_status()
-            pending = live_status.get('pending', [])
-            current = live_status.get('current', [])
+            log.debug("Download worker: Starting queue processing")
+            # While downloads are running the batch counter, queue drain and filesystem
+            # observer keep the catalog fresh; only an idle worker re-checks on a timer
+            if self._queue_idle and time.time() - self._last_reconcile >= self._idle_reconcile_interval:
+                self.reconcile_catalog()
+            # Read the published snapshot directly; only the head of pending is needed,
+            # so copying the whole queue into lists would be wasted work
+            current, pending, _completed = self._live_snapshot
 
-            print(f"Download worker: Queue status - {len(pending)} pending, {len(current)} current")
+            log.debug("Download worker: Queue status - %d pending, %d current", len(pending), len(current))
 
             if current:
-                print(f"Download worker: Skipping - already downloading {len(current)} items")
+                log.debug("Download worker: Skipping - already downloading %d items", len(current))
                 return
 
+            self._queue_idle = not pending
             if not pending:
-                print("Download worker: No pending items to process")
+                log.debug("Download worker: No pending items to process")
                 return
 
             item_to_process = dict(pending[0])
-            print(f"Download worker: Selected item: {item_to_process.get('artist','unknown')} - {item_to_process.get('title','')}")
+            log.debug("Download worker: Selected item: %s - %s", item_to_process.get('artist', 'unknown'), item_to_process.get('title', ''))
         except Exception as e:
-            print(f"Download worker: Error preparing queue: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Download worker: Error preparing queue: %s", e)
             return
 
         try:
-            print("Download worker: Loading configuration")
-            from youspotter.config import load_config
+            log.debug("Download worker: Loading configuration")
             cfg = load_config(self.db) if self.db else {}
             if not cfg.get('host_path'):
                 cfg = {
@@ -511,62 +614,51 @@ class SyncService:
                     "path_template": "{artist}/{album}/{artist} - {title}.{ext}",
                     "yt_cookie": ""
                 }
-                print("Download worker: Using fallback config")
+                log.debug("Download worker: Using fallback config")
             else:
-                print(f"Download worker: Loaded config - host_path: {cfg.get('host_path', 'N/A')}")
+                log.debug("Download worker: Loaded config - host_path: %s", cfg.get('host_path', 'N/A'))
         except Exception as e:
-            print(f"Download worker: Error loading config: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Download worker: Error loading config: %s", e)
             cfg = {"host_path": "/home/patrick/Music", "bitrate": 192, "format": "mp3"}
 
         try:
-            print("Download worker: Moving item to current queue")
-            print(f"Download worker: Item details: {item_to_process}")
+            log.debug("Download worker: Moving item to current queue: %s", item_to_process)
             self.live_move_to_current(item_to_process)
-            print(f"Download worker: Starting download: {item_to_process.get('artist','unknown')} - {item_to_process.get('title','')}")
         except Exception as e:
-            print(f"Download worker: Error moving to current queue: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Download worker: Error moving to current queue: %s", e)
             return
 
         # Search YouTube for track
         try:
-            print("Download worker: Searching YouTube for track")
-            search_query = f"{item_to_process.get('artist', 'unknown')} - {item_to_process.get('title', '')}"
-            print(f"Download worker: Search query: '{search_query}'")
-
-            candidates = self.search_youtube(item_to_process) or []
-            print(f"Download worker: Found {len(candidates)} YouTube candidates")
-
-            if candidates:
-                print("Download worker: Top candidates:")
+            debug = log.isEnabledFor(logging.DEBUG)
+            candidates = self._search_candidates(item_to_process)
+            if debug:
+                log.debug("Download worker: Found %d YouTube candidates for '%s - %s'", len(candidates),
+                          item_to_process.get('artist', 'unknown'), item_to_process.get('title', ''))
                 for i, c in enumerate(candidates[:3]):
-                    print(f"  {i+1}. {c.get('title', 'N/A')} (duration: {c.get('duration', 'N/A')}s)")
+                    log.debug("  %d. %s (duration: %ss)", i + 1, c.get('title', 'N/A'), c.get('duration', 'N/A'))
 
             picked = None
             use_strict = cfg.get('use_strict_matching', False)
+            # Normalize the target once rather than once per candidate
+            prepared_target = song_match_prepare(item_to_process)
+            mode = "strict" if use_strict else "fuzzy"
             for i, c in enumerate(candidates):
-                if song_match_fuzzy(c, item_to_process, use_strict=use_strict):
+                if song_match_fuzzy_prepared(c, prepared_target, use_strict=use_strict):
                     picked = c
-                    mode = "strict" if use_strict else "fuzzy"
-                    print(f"Download worker: Selected candidate #{i+1} ({mode} matching): {c.get('title', 'N/A')}")
+                    if debug:
+                        log.debug("Download worker: Selected candidate #%d (%s matching): %s", i + 1, mode, c.get('title', 'N/A'))
                     break
-                else:
-                    mode = "strict" if use_strict else "fuzzy"
-                    print(f"Download worker: Candidate #{i+1} rejected by {mode} matching algorithm: {c.get('title', 'N/A')}")
+                if debug:
+                    log.debug("Download worker: Candidate #%d rejected by %s matching: %s", i + 1, mode, c.get('title', 'N/A'))
 
             if not picked:
                 reason = "no search results" if not candidates else f"no matches among {len(candidates)} candidates"
-                print(f"Download worker: No match found - {reason}")
                 artist = item_to_process.get('artist', 'unknown')
                 title = item_to_process.get('title', '')
                 add_recent(f"No YouTube match for {artist} - {title} ({reason})", "ERROR")
         except Exception as e:
-            print(f"Download worker: Error in YouTube search: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Download worker: Error in YouTube search: %s", e)
             picked = None
 
         success = False
@@ -576,46 +668,49 @@ class SyncService:
 
         if picked:
             try:
-                from youspotter.status import queue_update_progress
+                # Progress can tick hundreds of times per download; key the item once
+                # instead of re-normalizing artist/title on every tick
+                status_item = queue_item(item_to_process)
 
                 def progress_callback(percent: int):
                     self.live_update_progress(item_to_process, percent)
-                    queue_update_progress(item_to_process, percent)
+                    queue_update_progress(status_item, percent)
 
                 cfg_with_progress = dict(cfg)
                 cfg_with_progress['progress_cb'] = progress_callback
 
-                import concurrent.futures
                 download_timeout = 300
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    print(f"Download worker: Starting download with {download_timeout}s timeout")
-                    future = executor.submit(self.download_func, picked, item_to_process, cfg_with_progress)
-                    self._current_download_future = future
-                    try:
-                        result = future.result(timeout=download_timeout)
-                        if isinstance(result, tuple):
-                            success, downloaded_path = result
-                        else:
-                            success = bool(result)
-                        print(f"Download worker: Download {'successful' if success else 'failed'}")
-                    except concurrent.futures.TimeoutError:
-                        success = False
-                        was_cancelled = True
-                        error_reason = f"timeout after {download_timeout}s"
-                        add_recent(f"Download timeout for {item_to_process.get('artist', 'unknown')} - {item_to_process.get('title', '')}", "ERROR")
-                        future.cancel()
-                    except concurrent.futures.CancelledError:
-                        success = False
-                        was_cancelled = True
-                        error_reason = "cancelled"
-                    finally:
-                        self._current_download_future = None
+                next_pending = self._live_snapshot[1]
+                if next_pending:
+                    self._prefetch_search(next_pending[0])
+                future = self._get_download_executor().submit(self.download_func, picked, item_to_process, cfg_with_progress)
+                self._current_download_future = future
+                try:
+                    result = future.result(timeout=download_timeout)
+                    if isinstance(result, tuple):
+                        success, downloaded_path = result
+                    else:
+                        success = bool(result)
+                    log.debug("Download worker: Download %s", 'successful' if success else 'failed')
+                except concurrent.futures.TimeoutError:
+                    success = False
+                    was_cancelled = True
+                    error_reason = f"timeout after {download_timeout}s"
+                    add_recent(f"Download timeout for {item_to_process.get('artist', 'unknown')} - {item_to_process.get('title', '')}", "ERROR")
+                    future.cancel()
+                    # The executor has a single worker: let an overrunning download finish
+                    # before the next item is submitted behind it
+                    concurrent.futures.wait([future])
+                except concurrent.futures.CancelledError:
+                    success = False
+                    was_cancelled = True
+                    error_reason = "cancelled"
+                finally:
+                    self._current_download_future = None
             except Exception as e:
                 success = False
                 error_reason = str(e)
-                print(f"Download worker: Download exception: {error_reason}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Download worker: Download exception: %s", error_reason)
         else:
             error_reason = "no candidate"
 
@@ -625,23 +720,38 @@ class SyncService:
                 title = item_to_process.get('title', '')
                 add_recent(f"Downloaded {artist} - {title}", "SUCCESS")
                 if self.db and downloaded_path:
-                    self.db.mark_download_success(identity_key(item_to_process), downloaded_path)
+                    self.db.mark_download_success(_live_identity(item_to_process), downloaded_path)
             else:
                 if not was_cancelled and self.db:
                     reason_message = error_reason or "download failed"
-                    self.db.mark_download_failure(identity_key(item_to_process), reason_message)
+                    self.db.mark_download_failure(_live_identity(item_to_process), reason_message)
 
             self.live_complete_item(item_to_process, success)
             self.sync_to_persistent_queue()
         except Exception as e:
-            print(f"Download worker: Error in completion handling: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Download worker: Error in completion handling: %s", e)
 
         if self.db:
-            self.reconcile_catalog(force=True)
+            self._downloads_since_reconcile += 1
+            if (self._downloads_since_reconcile >= self._reconcile_batch_size
+                    or not self._live_snapshot[1]):
+                self._downloads_since_reconcile = 0
+                self.reconcile_catalog(force=True)
+            else:
+                self._refresh_download_counts()
+
+        if self._live_snapshot[1]:
+            # More work queued: go straight to the next item
+            self._queue_event.set()
+        log.debug("Download worker: Processing completed for this iteration")
 
-        print("Download worker: Processing completed for this iteration")
+    def _refresh_download_counts(self):
+        """Publish downloaded/missing counters between batched reconciles (one COUNT query)."""
+        try:
+            counts = self.db.get_catalog_counts()
+            set_status({'downloaded': counts['downloaded'], 'missing': counts['missing']})
+        except Exception as exc:
+            log.warning("Failed to refresh download counts: %s", exc)
 
     def get_schedule(self) -> dict:
         return {
@@ -654,13 +764,12 @@ class SyncService:
         if self._thread and self._thread.is_alive():
             return
         def loop():
-            import time as _t
             while not self._stop.is_set():
                 # Indicate sync is running by clearing next_run_at
                 self.next_run_at = None
                 self.run_once(reason="scheduled")
 
-                completed_at = _t.time()
+                completed_at = time.time()
                 try:
                     self.next_run_at = int(completed_at + int(interval_seconds))
                 except Exception:
@@ -668,7 +777,7 @@ class SyncService:
 
                 # Wait the remaining interval duration (accounting for sync duration)
                 while not self._stop.is_set():
-                    now = _t.time()
+                    now = time.time()
                     wait_seconds = (completed_at + int(interval_seconds)) - now
                     if wait_seconds <= 0:
                         break
@@ -685,7 +794,7 @@ class SyncService:
                     # Wait in small increments so stop signal is responsive
                     sleep_for = min(wait_seconds, 1.0)
                     self._stop.wait(sleep_for)
-                completed_at = _t.time()
+                completed_at = time.time()
         self._stop.clear()
         # Record configured interval for status/debugging
         self._interval = int(interval_seconds)
@@ -694,6 +803,7 @@ class SyncService:
 
     def stop_scheduler(self):
         self._stop.set()
+        self._queue_event.set()
         if self._thread:
             self._thread.join(timeout=1.0)
 
@@ -704,10 +814,52 @@ class SyncService:
         self._download_thread = threading.Thread(target=self._download_worker_loop, daemon=True)
         self._download_thread.start()
 
+    def _get_download_executor(self):
+        with self._executor_lock:
+            if self._download_executor is None:
+                self._download_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='ys-dl'
+                )
+            return self._download_executor
+
+    def _get_search_executor(self):
+        with self._executor_lock:
+            if self._search_executor is None:
+                self._search_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='ys-search'
+                )
+            return self._search_executor
+
+    def _prefetch_search(self, item: Dict):
+        """Start the YouTube search for item so it overlaps the current download."""
+        try:
+            future = self._get_search_executor().submit(self.search_youtube, item)
+        except RuntimeError:
+            # Executor already shut down with the worker
+            return
+        self._prefetched_search = (_live_identity(item), future)
+
+    def _search_candidates(self, item: Dict) -> List[Dict]:
+        """Search results for item, reusing the prefetched search when it is for this item."""
+        prefetched, self._prefetched_search = self._prefetched_search, None
+        if prefetched is not None:
+            key, future = prefetched
+            if key == _live_identity(item):
+                return future.result() or []
+            future.cancel()
+        return self.search_youtube(item) or []
+
     def stop_download_worker(self):
         """Stop the download worker"""
         if self._download_thread:
             self._download_thread.join(timeout=1.0)
+        with self._executor_lock:
+            executors = (self._download_executor, self._search_executor)
+            self._download_executor = self._search_executor = None
+        self._prefetched_search = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
         self._stop_filesystem_monitor()
 
     def sync_now(self) -> bool:
@@ -723,21 +875,23 @@ class SyncService:
 
     def pause_downloads(self):
         """Pause the download worker and cancel current download"""
-        print("Download worker: Pausing downloads...")
+        log.info("Download worker: Pausing downloads")
         self._paused.set()  # Set pause flag
+        self._resume_event.clear()
 
         # Cancel current download if running
         if self._current_download_future:
             try:
                 self._current_download_future.cancel()
-                print("Download worker: Cancelled current download")
+                log.info("Download worker: Cancelled current download")
             except Exception as e:
-                print(f"Download worker: Error cancelling download: {e}")
+                log.warning("Download worker: Error cancelling download: %s", e)
 
     def resume_downloads(self):
         """Resume the download worker"""
-        print("Download worker: Resuming downloads...")
+        log.info("Download worker: Resuming downloads")
         self._paused.clear()  # Clear pause flag
+        self._resume_event.set()
 
     def is_paused(self) -> bool:
         """Check if downloads are currently paused"""
@@ -754,12 +908,22 @@ class SyncService:
     # Lightweight status tracking methods (deadlock-free)
     def get_live_queue_status(self) -> dict:
         """Get current queue status without database persistence"""
-        with self._status_lock:
-            return {
-                "current": list(self._live_status["current"]),
-                "pending": list(self._live_status["pending"]),
-                "completed": list(self._live_status["completed"])
-            }
+        current, pending, completed = self._live_snapshot
+        return {
+            "current": list(current),
+            "pending": list(pending),
+            "completed": list(completed)
+        }
+
+    def _publish_live(self, current=None, pending=None, completed=None):
+        """Swap in a new reader snapshot; call while holding the changed sections' locks."""
+        with self._publish_lock:
+            snap_current, snap_pending, snap_completed = self._live_snapshot
+            self._live_snapshot = (
+                snap_current if current is None else tuple(current.values()),
+                snap_pending if pending is None else tuple(pending.values()),
+                snap_completed if completed is None else tuple(completed),
+            )
 
     def bootstrap_live_queue_from_status(self):
         """Refresh live queue snapshot from persisted status state."""
@@ -767,92 +931,74 @@ class SyncService:
 
     def set_live_pending_queue(self, items: List[Dict]):
         """Set pending queue items"""
-        with self._status_lock:
-            self._live_status["pending"] = list(items)
+        pending = OrderedDict((_live_identity(it), it) for it in items)
+        with self._pending_lock:
+            self._live_status["pending"] = pending
+            self._publish_live(pending=pending)
+        self._queue_event.set()
 
     def live_move_to_current(self, item: Dict):
         """Move item to current downloads"""
-        with self._status_lock:
-            from youspotter.queue import identity_key
-            # Add to current with progress tracking
-            current_item = dict(item)
-            current_item['progress'] = 0
-            self._live_status["current"].append(current_item)
-
+        # Add to current with progress tracking
+        current_item = dict(item)
+        current_item['progress'] = 0
+        item_key = _live_identity(item)
+        with self._pending_lock, self._current_lock:
+            self._live_status["current"][item_key] = current_item
             # Remove from pending
-            item_key = identity_key(item)
-            self._live_status["pending"] = [
-                p for p in self._live_status["pending"]
-                if identity_key(p) != item_key
-            ]
+            self._live_status["pending"].pop(item_key, None)
+            self._publish_live(current=self._live_status["current"], pending=self._live_status["pending"])
 
     def live_update_progress(self, item: Dict, progress: int):
         """Update progress for current download"""
-        with self._status_lock:
-            from youspotter.queue import identity_key
-            item_key = identity_key(item)
-            for current_item in self._live_status["current"]:
-                if identity_key(current_item) == item_key:
-                    current_item['progress'] = progress
-                    break
+        item_key = _live_identity(item)
+        with self._current_lock:
+            current_item = self._live_status["current"].get(item_key)
+            if current_item is not None:
+                current_item['progress'] = progress
 
     def live_complete_item(self, item: Dict, success: bool):
         """Complete an item (move from current to completed)"""
-        with self._status_lock:
-            from youspotter.queue import identity_key
-            from datetime import datetime
-
-            # Remove from current
-            item_key = identity_key(item)
-            self._live_status["current"] = [
-                c for c in self._live_status["current"]
-                if identity_key(c) != item_key
-            ]
-
-            # Add to completed
-            completed_item = dict(item)
-            completed_item["status"] = "downloaded" if success else "missing"
-            completed_item["timestamp"] = datetime.now(timezone.utc).isoformat()
-            self._live_status["completed"].insert(0, completed_item)
+        item_key = _live_identity(item)
+        completed_item = dict(item)
+        completed_item["status"] = "downloaded" if success else "missing"
+        completed_item["timestamp"] = now_iso()
+        with self._current_lock, self._completed_lock:
+            # Remove from current, add to completed
+            self._live_status["current"].pop(item_key, None)
+            self._live_status["completed"].appendleft(completed_item)
+            self._publish_live(current=self._live_status["current"], completed=self._live_status["completed"])
 
     def sync_to_persistent_queue(self):
         """Sync live queue state to persistent queue for UI and persistence"""
         try:
-            from youspotter.status import set_queue
-            with self._status_lock:
-                # Sync pending and current items to persistent queue
-                pending_items = list(self._live_status["pending"])
-                current_items = list(self._live_status["current"])
+            # Sync pending and current items to persistent queue
+            current_items, pending_items, _completed = self._live_snapshot
 
-                # Combine for persistent queue (UI expects pending to include current)
-                all_pending = current_items + pending_items
-                set_queue(all_pending)
+            # Combine for persistent queue (UI expects pending to include current)
+            set_queue(current_items + pending_items)
 
-                print(f"Synced to persistent: {len(current_items)} current + {len(pending_items)} pending")
+            log.debug("Synced to persistent: %d current + %d pending", len(current_items), len(pending_items))
         except Exception as e:
-            print(f"Error syncing to persistent queue: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error syncing to persistent queue: %s", e)
 
     def _load_persistent_into_live(self):
         """Load persistent queue into live queue on startup"""
         try:
-            from youspotter.status import get_status
             status = get_status()
             persistent_pending = status.get('queue', {}).get('pending', [])
             persistent_current = status.get('queue', {}).get('current', [])
 
-            with self._status_lock:
-                # Restore any pending items to live queue
-                self._live_status["pending"] = list(persistent_pending)
-                # Any items that were "current" should go back to pending
-                # (they weren't completed in previous session)
-                self._live_status["pending"].extend(persistent_current)
+            # Restore any pending items to live queue; any items that were "current"
+            # go back to pending too (they weren't completed in previous session)
+            pending = OrderedDict((_live_identity(it), it) for it in persistent_pending)
+            pending.update((_live_identity(it), it) for it in persistent_current)
+            with self._pending_lock, self._current_lock:
+                self._live_status["pending"] = pending
                 # Clear current - download worker will populate as needed
-                self._live_status["current"] = []
+                self._live_status["current"] = {}
+                self._publish_live(current=self._live_status["current"], pending=pending)
 
-                print(f"Loaded persistent queue: {len(persistent_pending + persistent_current)} items restored to pending")
+            log.info("Loaded persistent queue: %d items restored to pending", len(pending))
         except Exception as e:
-            print(f"Error loading persistent queue: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error loading persistent queue: %s", e)
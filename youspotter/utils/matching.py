@@ -1,28 +1,75 @@
 import re
 import unicodedata
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
-FEAT_PATTERNS = [r"\s*\(feat\..*?\)", r"\s*\[feat\..*?\]", r"\s*feat\..*$"]
+try:
+    # C implementation of the same edit distance; the pure-Python DP below is the fallback
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+except Exception:  # pragma: no cover
+    _RFLevenshtein = None
 
+FEAT_PATTERNS = [r"\s*\(feat\..*?\)", r"\s*\[feat\..*?\]", r"\s*feat\..*$"]
+# All three patterns fused into one alternation so "feat." credits are stripped in one pass
+_FEAT_RE = re.compile("|".join(f"(?:{pat})" for pat in FEAT_PATTERNS))
+# "ft." / "featuring" credits, bracketed or trailing after " - ". A bare word in the
+# middle of a title is left alone. Only candidate matching strips these:
+# normalize_text() feeds identity_key(), so it must not change.
+_MATCH_FEAT_RE = re.compile(
+    r"\s*\((?:ft\.|featuring\b).*?\)|\s*\[(?:ft\.|featuring\b).*?\]|\s+-\s+(?:ft\.|featuring\b).*$"
+)
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_SPACES_RE = re.compile(r"\s+")
+_OFFICIAL_CHANNEL_RE = re.compile(r"official", re.IGNORECASE)
+_MUSIC_URL_RE = re.compile(r"music\.youtube\.com", re.IGNORECASE)
+# Per-character ASCII folding for Latin-1 and Latin Extended-A, derived from the same
+# NFKD/ASCII-ignore rule, so most accented metadata folds with one str.translate() call
+_ASCII_FOLD = {
+    cp: unicodedata.normalize('NFKD', chr(cp)).encode('ascii', 'ignore').decode('ascii')
+    for cp in range(0x80, 0x180)
+}
+
+
+# Artist names (and many titles) repeat across a library, so each distinct string is
+# normalized once per process rather than once per track and per candidate comparison
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
-    txt = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii')
-    txt = txt.lower()
-    for pat in FEAT_PATTERNS:
-        txt = re.sub(pat, '', txt).strip()
-    txt = re.sub(r"[^a-z0-9\s]", " ", txt)
-    txt = re.sub(r"\s+", " ", txt).strip()
-    return txt
+    txt = _FEAT_RE.sub('', _fold_lower(text)).strip()
+    return _collapse(txt)
+
+@lru_cache(maxsize=8192)
+def normalize_match_text(text: str) -> str:
+    """normalize_text() that also drops "ft."/"featuring" credits; for matching only."""
+    txt = _FEAT_RE.sub('', _fold_lower(text)).strip()
+    txt = _MATCH_FEAT_RE.sub('', txt).strip()
+    return _collapse(txt)
+
+def _fold_lower(text: str) -> str:
+    txt = (text or '').translate(_ASCII_FOLD)
+    if not txt.isascii():
+        txt = unicodedata.normalize('NFKD', txt).encode('ascii', 'ignore').decode('ascii')
+    return txt.lower()
+
+def _collapse(txt: str) -> str:
+    txt = _NON_ALNUM_RE.sub(" ", txt)
+    return _SPACES_RE.sub(" ", txt).strip()
 
 def duration_within_tolerance(target_seconds: int, candidate_seconds: int, tolerance: int = 5) -> bool:
     return abs(int(target_seconds) - int(candidate_seconds)) <= tolerance
 
 def is_official_source(candidate: Dict) -> bool:
-    channel = (candidate.get('channel') or '').lower()
-    url = (candidate.get('url') or '').lower()
-    return 'official' in channel or 'music.youtube.com' in url
+    return bool(_OFFICIAL_CHANNEL_RE.search(candidate.get('channel') or '')
+                or _MUSIC_URL_RE.search(candidate.get('url') or ''))
+
+def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """Calculate Levenshtein distance between two strings
 
-def levenshtein_distance(s1: str, s2: str) -> int:
-    """Calculate Levenshtein distance between two strings"""
+    With max_distance, any distance above it is reported as max_distance + 1.
+    """
+    if _RFLevenshtein is not None:
+        return _RFLevenshtein.distance(s1, s2, score_cutoff=max_distance)
+    if max_distance is not None:
+        return _levenshtein_bounded(s1, s2, max_distance)
     if len(s1) < len(s2):
         return levenshtein_distance(s2, s1)
 
@@ -41,17 +88,77 @@ def levenshtein_distance(s1: str, s2: str) -> int:
 
     return previous_row[-1]
 
+def _levenshtein_bounded(s1: str, s2: str, max_dist: int) -> int:
+    """levenshtein_distance() limited to the diagonal band |i - j| <= max_dist (Ukkonen).
+
+    Cells outside the band cost more than max_dist by construction, so they are never
+    computed; any distance above max_dist is returned as max_dist + 1.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    n, m = len(s1), len(s2)
+    over = max_dist + 1
+    if n - m > max_dist:
+        return over
+
+    previous_row = [j if j <= max_dist else over for j in range(m + 1)]
+    for i in range(1, n + 1):
+        c1 = s1[i - 1]
+        lo, hi = max(1, i - max_dist), min(m, i + max_dist)
+        current_row = [over] * (m + 1)
+        current_row[0] = i if i <= max_dist else over
+        for j in range(lo, hi + 1):
+            insertions = previous_row[j] + 1
+            deletions = current_row[j - 1] + 1
+            substitutions = previous_row[j - 1] + (c1 != s2[j - 1])
+            current_row[j] = min(insertions, deletions, substitutions, over)
+        # Row minimums never decrease, so no later row can get back under the bound
+        if min(current_row[lo - 1:hi + 1]) > max_dist:
+            return over
+        previous_row = current_row
+
+    return previous_row[m]
+
 def string_similarity(s1: str, s2: str) -> float:
     """Calculate string similarity (0.0 to 1.0) using normalized Levenshtein distance"""
     if not s1 and not s2:
         return 1.0
     if not s1 or not s2:
         return 0.0
+    if _RFLevenshtein is not None:
+        return _RFLevenshtein.normalized_similarity(s1, s2)
 
     max_len = max(len(s1), len(s2))
     distance = levenshtein_distance(s1, s2)
     return 1.0 - (distance / max_len)
 
+def _similar_enough(s1: str, s2: str, threshold: float) -> bool:
+    """string_similarity(s1, s2) >= threshold, skipping Levenshtein when lengths rule it out."""
+    longest = max(len(s1), len(s2))
+    # The edit distance is at least the length difference, which caps the similarity
+    if longest and min(len(s1), len(s2)) / longest < threshold:
+        return False
+    if not s1 or not s2:
+        return string_similarity(s1, s2) >= threshold
+    if _RFLevenshtein is not None:
+        # With a cutoff RapidFuzz stops as soon as the threshold is out of reach (0.0 below it)
+        return _RFLevenshtein.normalized_similarity(s1, s2, score_cutoff=threshold) >= threshold
+    # Largest distance the threshold allows; the epsilon absorbs rounding in (1 - threshold)
+    max_dist = int((1 - threshold) * longest + 1e-9)
+    distance = levenshtein_distance(s1, s2, max_distance=max_dist)
+    return distance <= max_dist and 1.0 - distance / longest >= threshold
+
+PreparedTarget = Tuple[str, str, int]
+
+
+def song_match_prepare(target: Dict) -> PreparedTarget:
+    """Normalize a target track once for repeated matching against many candidates."""
+    return (
+        normalize_match_text(target.get('artist', '')),
+        normalize_match_text(target.get('title', '')),
+        target.get('duration', 0),
+    )
+
 def song_match_fuzzy(candidate: Dict, target: Dict,
                      title_threshold: float = 0.8,
                      artist_threshold: float = 0.7,
@@ -62,28 +169,33 @@ def song_match_fuzzy(candidate: Dict, target: Dict,
     candidate: { 'artist': str, 'title': str, 'duration': int, 'channel': str, 'url': str }
     target: { 'artist': str, 'title': str, 'duration': int }
     """
+    return song_match_fuzzy_prepared(candidate, song_match_prepare(target), title_threshold,
+                                     artist_threshold, duration_tolerance, use_strict)
+
+def song_match_fuzzy_prepared(candidate: Dict, prepared: PreparedTarget,
+                              title_threshold: float = 0.8,
+                              artist_threshold: float = 0.7,
+                              duration_tolerance: int = 10,
+                              use_strict: bool = False) -> bool:
+    """song_match_fuzzy() against a target already normalized by song_match_prepare()."""
     if use_strict:
-        return song_match_strict(candidate, target, duration_tolerance)
+        return _song_match_strict_prepared(candidate, prepared, duration_tolerance)
 
-    ca = normalize_text(candidate.get('artist', ''))
-    ct = normalize_text(candidate.get('title', ''))
-    ta = normalize_text(target.get('artist', ''))
-    tt = normalize_text(target.get('title', ''))
+    ta, tt, target_duration = prepared
+    # Duration is the cheapest check and rejects most wrong candidates, so it runs
+    # before the Levenshtein comparisons
+    if not duration_within_tolerance(target_duration, candidate.get('duration') or 0, duration_tolerance):
+        return False
+
+    ct = normalize_match_text(candidate.get('title', ''))
 
     # Check title similarity
-    title_sim = string_similarity(ct, tt)
-    if title_sim < title_threshold:
+    if not _similar_enough(ct, tt, title_threshold):
         return False
 
     # Check artist similarity
-    artist_sim = string_similarity(ca, ta)
-    if artist_sim < artist_threshold:
-        return False
-
-    # Check duration tolerance
-    dur_ok = duration_within_tolerance(target.get('duration', 0), candidate.get('duration', 0), duration_tolerance)
-
-    return dur_ok
+    ca = normalize_match_text(candidate.get('artist', ''))
+    return _similar_enough(ca, ta, artist_threshold)
 
 def song_match_strict(candidate: Dict, target: Dict, duration_tolerance: int = 5) -> bool:
     """
@@ -91,14 +203,19 @@ def song_match_strict(candidate: Dict, target: Dict, duration_tolerance: int = 5
     candidate: { 'artist': str, 'title': str, 'duration': int, 'channel': str, 'url': str }
     target: { 'artist': str, 'title': str, 'duration': int }
     """
-    ca = normalize_text(candidate.get('artist', ''))
-    ct = normalize_text(candidate.get('title', ''))
-    ta = normalize_text(target.get('artist', ''))
-    tt = normalize_text(target.get('title', ''))
-    if ca != ta or ct != tt:
+    # Identical raw strings normalize identically, so only the duration is left to check
+    if (candidate.get('artist', '') == target.get('artist', '')
+            and candidate.get('title', '') == target.get('title', '')):
+        return duration_within_tolerance(target.get('duration', 0), candidate.get('duration') or 0,
+                                          duration_tolerance)
+    return _song_match_strict_prepared(candidate, song_match_prepare(target), duration_tolerance)
+
+def _song_match_strict_prepared(candidate: Dict, prepared: PreparedTarget, duration_tolerance: int) -> bool:
+    ta, tt, target_duration = prepared
+    if not duration_within_tolerance(target_duration, candidate.get('duration') or 0, duration_tolerance):
         return False
-    dur_ok = duration_within_tolerance(target.get('duration', 0), candidate.get('duration', 0), duration_tolerance)
-    return dur_ok
+    return (normalize_match_text(candidate.get('artist', '')) == ta
+            and normalize_match_text(candidate.get('title', '')) == tt)
 
 def song_match(candidate: Dict, target: Dict) -> bool:
     """
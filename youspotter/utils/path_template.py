@@ -1,6 +1,15 @@
 import re
+from functools import lru_cache
 
 ALLOWED_VARS = {"artist", "album", "title", "ext"}
+_VAR_RE = re.compile(r"\{([a-zA-Z0-9_]+)\}")
+_PLACEHOLDER_RE = re.compile(r"\{(artist|album|title|ext)\}")
+_PATH_GROUPS = {
+    "artist": r"(?P<artist>.+?)",
+    "album": r"(?P<album>.+?)",
+    "title": r"(?P<title>.+?)",
+    "ext": r"(?P<ext>[^/]+)",
+}
 
 
 def validate_user_template(tmpl: str) -> None:
@@ -8,7 +17,7 @@ def validate_user_template(tmpl: str) -> None:
         raise ValueError("template must be relative, not start with '/'")
     if ".." in tmpl:
         raise ValueError("template must not contain '..'")
-    vars_found = set(re.findall(r"\{([a-zA-Z0-9_]+)\}", tmpl))
+    vars_found = set(_VAR_RE.findall(tmpl))
     illegal = vars_found - ALLOWED_VARS
     if illegal:
         raise ValueError(f"illegal variables in template: {', '.join(sorted(illegal))}")
@@ -16,15 +25,13 @@ def validate_user_template(tmpl: str) -> None:
         raise ValueError("template must include {ext}")
 
 
+@lru_cache(maxsize=32)
 def to_ytdlp_outtmpl(tmpl: str) -> str:
     validate_user_template(tmpl)
-    out = tmpl
-    for var in ALLOWED_VARS:
-        out = out.replace("{" + var + "}", f"%({var})s")
-    return out
-
+    return _PLACEHOLDER_RE.sub(lambda m: f"%({m.group(1)})s", tmpl)
 
 
+@lru_cache(maxsize=32)
 def to_path_regex(tmpl: str) -> str:
     r"""Convert a user template into a regex over a POSIX-style relative path.
 
@@ -34,17 +41,9 @@ def to_path_regex(tmpl: str) -> str:
     We keep the groups non-greedy to avoid over-capturing across separators.
     """
     validate_user_template(tmpl)
-    # Temporarily replace placeholders with tokens, then escape, then re-insert groups
-    tok_map = {var: f"__VAR_{var.upper()}__" for var in ALLOWED_VARS}
-    tmp = tmpl
-    for var, tok in tok_map.items():
-        tmp = tmp.replace("{" + var + "}", tok)
-    import re as _re
-    esc = _re.escape(tmp)
-    # Replace tokens with named groups
-    esc = esc.replace(tok_map['artist'], r"(?P<artist>.+?)")
-    esc = esc.replace(tok_map['album'], r"(?P<album>.+?)")
-    esc = esc.replace(tok_map['title'], r"(?P<title>.+?)")
-    esc = esc.replace(tok_map['ext'], r"(?P<ext>[^/]+)")
+    # split() alternates literal text (even indexes) with placeholder names (odd indexes):
+    # escape the literals and turn each placeholder into its named group
+    parts = _PLACEHOLDER_RE.split(tmpl)
+    esc = "".join(_PATH_GROUPS[part] if i % 2 else re.escape(part) for i, part in enumerate(parts))
     # Anchor to full relative path
     return r"^" + esc + r"$"
@@ -1,16 +1,37 @@
 import json
 import time
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
 
 from flask import (Blueprint, jsonify, redirect, render_template, request,
                    url_for)
 
+from .logging import get_logger, with_context
 from .spotify_client import SpotifyClient
 from .storage import DB
 
 
+@lru_cache(maxsize=4)
+def _parse_selection(raw: str) -> Tuple[Dict, FrozenSet[str]]:
+    """Parse the selected_playlists setting into (strategies, selected ids).
+
+    Cached on the raw string; callers must not mutate the returned strategies.
+    """
+    strategies = {}
+    try:
+        strategies = json.loads(raw) if raw else {}
+    except Exception:
+        for pid in (raw.split(',') if raw else []):
+            strategies[pid] = {'song': False, 'artist': False, 'album': False}
+    return strategies, frozenset(strategies.keys())
+
+
 def init_web(app, db: DB, service):
     bp = Blueprint('web', __name__)
     sc = SpotifyClient(db)
+    # In-process copy of the 'playlist_cache' kv payload; this route is its only writer,
+    # so warm requests skip the SQLite read and JSON parse
+    playlist_cache_mem: dict = {}
 
     def _get_redirect_uri():
         # Use request context to generate the redirect URI with HTTPS
@@ -58,13 +79,18 @@ def init_web(app, db: DB, service):
         now = int(time.time())
 
         def load_cache():
+            if playlist_cache_mem:
+                return playlist_cache_mem
             raw_cache = db.get_kv('playlist_cache') or ''
             if not raw_cache:
                 return {}
             try:
-                return json.loads(raw_cache)
+                payload = json.loads(raw_cache)
             except Exception:
                 return {}
+            if isinstance(payload, dict):
+                playlist_cache_mem.update(payload)
+            return payload
 
         def save_cache(data):
             payload = {
@@ -74,27 +100,25 @@ def init_web(app, db: DB, service):
             }
             db.set_kv('playlist_cache', json.dumps(payload))
             db.set_kv('playlist_rate_limited_until', '0')
+            playlist_cache_mem.clear()
+            playlist_cache_mem.update(payload)
 
         def apply_selection(pls):
-            raw = db.get_setting('selected_playlists') or ''
-            strategies = {}
-            try:
-                strategies = json.loads(raw) if raw else {}
-            except Exception:
-                for pid in (raw.split(',') if raw else []):
-                    strategies[pid] = {'song': False, 'artist': False, 'album': False}
-            selected_ids = set(strategies.keys())
+            strategies, selected_ids = _parse_selection(db.get_setting('selected_playlists') or '')
             result = []
             for p in pls:
-                entry = dict(p)
-                entry['selected'] = entry.get('id') in selected_ids
-                st = strategies.get(entry.get('id'), {'song': False, 'artist': False, 'album': False})
+                pid = p.get('id')
+                st = strategies.get(pid)
                 if not isinstance(st, dict):
-                    st = {'song': False, 'artist': False, 'album': False}
-                entry['song'] = bool(st.get('song'))
-                entry['artist'] = bool(st.get('artist'))
-                entry['album'] = bool(st.get('album'))
-                result.append(entry)
+                    st = {}
+                # Cached playlist entries are shared, so each response gets its own dicts
+                result.append({
+                    **p,
+                    'selected': pid in selected_ids,
+                    'song': bool(st.get('song')),
+                    'artist': bool(st.get('artist')),
+                    'album': bool(st.get('album')),
+                })
             return result
 
         cache = load_cache()
@@ -104,8 +128,7 @@ def init_web(app, db: DB, service):
         # Helper function to add Liked Songs to any playlist list
         def add_liked_songs_to_playlists(pls):
             try:
-                liked_tracks = sc.user_saved_tracks()
-                liked_count = len(liked_tracks)
+                liked_count = sum(1 for _ in sc.iter_user_saved_tracks())
             except Exception:
                 liked_count = 0
 
@@ -156,7 +179,6 @@ def init_web(app, db: DB, service):
         save_cache(pls)
         enriched = apply_selection(pls)
 
-        from .logging import get_logger, with_context
         try:
             logger, _ = with_context(get_logger(__name__))
             logger.info(f"/playlists -> {len(enriched)} items")
@@ -172,7 +194,6 @@ def init_web(app, db: DB, service):
 
     @bp.post('/playlists')
     def save_playlists():
-        import json
         data = request.get_json(force=True, silent=True) or {}
         items = data.get('items') or []
         if not isinstance(items, list):
@@ -188,8 +209,6 @@ def init_web(app, db: DB, service):
         db.set_setting('selected_playlists', json.dumps(strat))
         # Auto-start scheduler if configured
         try:
-            from .sync_service import SyncService  # type: ignore
-
             # service passed via closure
             if _config_ready(db) and service:
                 service.start_scheduler(interval_seconds=900)
@@ -1,7 +1,19 @@
+import re
 from typing import List, Dict
 from ytmusicapi import YTMusic
 from .logging import get_logger, with_context
 
+# "m:ss" or "h:mm:ss" as shown in search results
+_DUR_RE = re.compile(r"^(?:(\d+):)?(\d+):(\d+)$")
+
+
+def _parse_duration(dur_str) -> int:
+    m = _DUR_RE.match(dur_str.strip()) if isinstance(dur_str, str) else None
+    if not m:
+        return 0
+    hours, minutes, seconds = m.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
 
 class YouTubeMusicClient:
     def __init__(self):
@@ -18,16 +30,7 @@ class YouTubeMusicClient:
             return []
         candidates = []
         for r in results:
-            dur_str = r.get("duration") or "0:00"
-            dur = 0
-            try:
-                parts = [int(x) for x in dur_str.split(":")]
-                if len(parts) == 2:
-                    dur = parts[0] * 60 + parts[1]
-                elif len(parts) == 3:
-                    dur = parts[0] * 3600 + parts[1] * 60 + parts[2]
-            except Exception:
-                dur = 0
+            dur = _parse_duration(r.get("duration"))
             # Extract thumbnail URL (get highest quality available)
             thumbnail_url = None
             thumbnails = r.get("thumbnails", [])